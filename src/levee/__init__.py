@@ -18,10 +18,12 @@ from .chart import Chart
 from .state import State
 from .effect import Effect
 from .condition import Condition
+from .builder import ChartBuilder
 
 __all__ = [
     Chart,
     State,
     Effect,
-    Condition
+    Condition,
+    ChartBuilder
 ]
\ No newline at end of file
@@ -0,0 +1,23 @@
+class BatchResult:
+    """
+    The outcome of `Chart.bulk_to()` for a single stateful object
+    """
+    __slots__ = ('obj', 'status', 'state', 'reason')
+
+    MOVED = 'moved'
+    BLOCKED = 'blocked'
+    NO_TRANSITION = 'no_transition'
+    CONFLICT = 'conflict'
+
+    def __init__(self, obj, status, state, reason=None):
+        self.obj = obj
+        self.status = status
+        self.state = state
+        self.reason = reason
+
+    def __bool__(self):
+        return self.status == self.MOVED
+
+    def __repr__(self):
+        reason = f' ({self.reason})' if self.reason is not None else ''
+        return f'<{self.__class__.__name__} {self.status} {self.state}{reason}>'
@@ -0,0 +1,198 @@
+from importlib import import_module
+from inspect import isclass
+from .condition import Condition, ConditionalExpression
+from .effect import Effect, EffectExpression
+from .plan import TransitionPlan
+from .exceptions import ChartSyntaxError
+from .state import State
+
+def import_reference(reference):
+    """Import the object an import path like 'module:Qual.Name' or 'module.Name' points to"""
+    module_name, _, qualname = reference.rpartition(':')
+    if not module_name:
+        module_name, _, qualname = reference.rpartition('.')
+    value = import_module(module_name)
+    for attr in qualname.split('.'):
+        value = getattr(value, attr)
+    return value
+
+# The Condition and Effect references of a transition without either
+NO_REFERENCES = (None, None)
+
+class ChartBuilder:
+    """
+    Build a Chart class from plain data instead of a class body.
+
+    States are names or `State` classes. Conditions and Effects are classes
+    or references to them, either names given in `references` or import
+    paths like `'package.module:Name'`. Conditions combine with nested lists
+    like `['or', 'Sometimes', ['not', 'Maybe']]` and Effects chain in order
+    with lists like `['PrintWhatever', 'SayHello']`.
+
+    ```python
+    FlowChart = ChartBuilder('FlowChart', references={'Sometimes': Sometimes}) \\
+        .transition('ALPHA', 'BETA', condition='Sometimes') \\
+        .transition('BETA', 'ALPHA') \\
+        .build()
+    ```
+    """
+    operators = {
+        'not': ConditionalExpression.Operators.NOT,
+        '~': ConditionalExpression.Operators.NOT,
+        'and': ConditionalExpression.Operators.AND,
+        '&': ConditionalExpression.Operators.AND,
+        'or': ConditionalExpression.Operators.OR,
+        '|': ConditionalExpression.Operators.OR,
+    }
+
+    def __init__(self, name, base=None, references=None, **attrs):
+        self.name = name
+        self.base = base
+        self.references = references or {}
+        self.attrs = attrs
+        self.states = {}
+        self.transitions = {}
+
+    def state(self, state):
+        """Declare a State by name or class, in order"""
+        if type(state) is str and state in self.states:
+            return self
+        if isclass(state) and issubclass(state, State):
+            state_class = state
+        elif type(state) is str:
+            if not state.isupper():
+                raise ChartSyntaxError(f'State {state} should be all uppercase')
+            state_class = self.states.get(state) or type(state, (State,), {})
+        else:
+            raise ChartSyntaxError(f'{self.name}: States must be a name or State class, not {state!r}')
+        self.states.setdefault(state_class.value, state_class)
+        self.transitions.setdefault(state_class.value, {})
+        return self
+
+    def transition(self, from_state, to_state, condition=None, effect=None):
+        """Declare a transition, with an optional Condition and Effect"""
+        self.state(from_state)
+        self.state(to_state)
+        from_value = from_state if type(from_state) is str else from_state.value
+        to_value = to_state if type(to_state) is str else to_state.value
+        self.transitions[from_value][to_value] = (condition, effect)
+        return self
+
+    def update(self, spec):
+        """
+        Declare everything in a spec shaped like the class body `chart`:
+        `{'states': [...], 'transitions': {'ALPHA': {'BETA': {'condition': ..., 'effect': ...}}}}`
+        """
+        for state in spec.get('states', ()):
+            self.state(state)
+        states = self.states
+        for from_state, to_states in spec.get('transitions', {}).items():
+            self.state(from_state)
+            entry = self.transitions[from_state if type(from_state) is str else from_state.value]
+            # Like `transition`, without redeclaring States already declared
+            for to_state, transition in to_states.items():
+                if type(to_state) is str:
+                    if to_state not in states:
+                        self.state(to_state)
+                    to_value = to_state
+                else:
+                    self.state(to_state)
+                    to_value = to_state.value
+                entry[to_value] = (transition.get('condition'), transition.get('effect')) if transition \
+                    else NO_REFERENCES
+        return self
+
+    def reference(self, reference):
+        """Get the class a reference points to"""
+        if type(reference) is not str:
+            return reference
+        if reference in self.references:
+            return self.references[reference]
+        try:
+            return import_reference(reference)
+        except (ImportError, AttributeError, ValueError):
+            raise ChartSyntaxError(f'{self.name}: Could not find reference "{reference}"')
+
+    def condition(self, condition):
+        """Turn a Condition reference or nested list into a Condition or ConditionalExpression"""
+        if isinstance(condition, (list, tuple)):
+            operator, *operands = condition
+            try:
+                operator = self.operators[operator]
+            except (KeyError, TypeError):
+                raise ChartSyntaxError(f'{self.name}: Unknown Condition operator {operator!r}')
+            operands = [self.condition(operand) for operand in operands]
+            if operator is ConditionalExpression.Operators.NOT:
+                if len(operands) != 1:
+                    raise ChartSyntaxError(f'{self.name}: `{operator.value}` takes exactly one Condition')
+                return ConditionalExpression(operands[0], operator=operator)
+            if len(operands) == 0:
+                raise ChartSyntaxError(f'{self.name}: `{operator.value}` takes at least one Condition')
+            expression = operands[0]
+            for operand in operands[1:]:
+                expression = ConditionalExpression(expression, operand, operator=operator)
+            return expression
+        condition = self.reference(condition)
+        if not (isinstance(condition, ConditionalExpression) or isclass(condition) and issubclass(condition, Condition)):
+            raise ChartSyntaxError(f'{self.name}: {condition!r} is not a Condition')
+        return condition
+
+    def effect(self, effect):
+        """Turn an Effect reference or list of them into an Effect or EffectExpression"""
+        if isinstance(effect, (list, tuple)):
+            if len(effect) == 0:
+                return None
+            expression = self.effect(effect[0])
+            for operand in effect[1:]:
+                expression = EffectExpression(expression, self.effect(operand), operator=EffectExpression.Operators.PLUS)
+            return expression
+        effect = self.reference(effect)
+        if not (isinstance(effect, EffectExpression) or isclass(effect) and issubclass(effect, Effect)):
+            raise ChartSyntaxError(f'{self.name}: {effect!r} is not an Effect')
+        return effect
+
+    def realize(self, to_state, condition, effect):
+        """Get the transition to a State with a Condition and Effect reference, like `TO_STATE (Condition) [Effect]`"""
+        transition = to_state(self.condition(condition)) if condition is not None \
+            else to_state(conditionless=True)
+        effect = self.effect(effect) if effect is not None else None
+        if effect is not None:
+            transition = transition[effect]
+        return transition
+
+    def plans(self):
+        """
+        Compile a `TransitionPlan` for every declared transition, straight from the data.
+        Transitions to the same State with the same references are realized and compiled once.
+        """
+        transitions = {}
+        compiled = {}
+        plans = {}
+        for from_value, to_states in self.transitions.items():
+            source = self.states[from_value]
+            entry = plans[source] = {}
+            for to_value, (condition, effect) in to_states.items():
+                key = to_value if condition is None and effect is None \
+                    else (to_value, frozen(condition), frozen(effect))
+                transition = transitions.get(key)
+                if transition is None:
+                    transition = transitions[key] = self.realize(self.states[to_value], condition, effect)
+                entry[to_value] = TransitionPlan(source, transition, compiled)
+        return plans
+
+    def build(self):
+        """
+        Create the Chart class. Its plans are compiled here rather than from a class
+        body `chart`, skipping validation the builder makes unnecessary, so the class
+        has `transitions` and `plans` but no `chart`.
+        """
+        from .chart import Chart
+        base = self.base or Chart
+        attrs = { **self.attrs, **self.states, '_plans': self.plans() }
+        return type(base)(self.name, (base,), attrs)
+
+def frozen(reference):
+    """Get a hashable copy of a reference, with nested lists as tuples"""
+    if isinstance(reference, (list, tuple)):
+        return tuple(frozen(item) for item in reference)
+    return reference
@@ -1,9 +1,26 @@
+from asyncio import gather
+from time import perf_counter, time
+from collections import deque
 from inspect import isclass
-from .exceptions import ChartSyntaxError, LeveeException, TransitionError, TransitionDoesNotExist, TransitionMissingArgs, TransitionNotAllowed
+from .exceptions import ChartSyntaxError, LeveeException, TransitionError, TransitionDoesNotExist, TransitionMissingArgs, TransitionNotAllowed, TransitionConflict
 from .state import State
+from .context import EvaluationContext
+from .plan import TransitionPlan, shared_operands
+from .batch import BatchResult
+from .builder import ChartBuilder, import_reference
+from .storage import SubchartStorage, default_storage
+from .journal import JournalEntry, digest
+from . import graph
 
 class ChartMeta(type):
 
+    def __new__(meta, chart_name, class_extends, class_attrs, **kwargs):
+        # Opted in Charts keep to the slots of `Chart`, without a `__dict__` per stateful object
+        slotted = class_attrs.get('slotted', any(getattr(base, 'slotted', False) for base in class_extends))
+        if slotted and '__slots__' not in class_attrs:
+            class_attrs = { **class_attrs, '__slots__': () }
+        return super().__new__(meta, chart_name, class_extends, class_attrs, **kwargs)
+
     def __init__(self, chart_name, class_extends, class_attrs, **kwargs):
         # Extract the possible States from the Chart class body, with validation
         state_classes = []
@@ -19,48 +36,121 @@ class ChartMeta(type):
         self.states = tuple(state_classes)
         self.state_values = tuple(state_class.value for state_class in state_classes)
 
-        # Extract the possible transitions from the Chart class body, with validation
-        self.transitions = {}
-        chart = class_attrs.get('chart', {})
-        if type(chart) is not dict:
-            raise ChartSyntaxError(f'{chart_name}: chart must be a dict, not a {type(chart)}')
-        if any(from_state is Ellipsis for from_state in chart):
-            raise ChartSyntaxError(f'{chart_name}: Ellipsis `...` does nothing at the root level')
-        if any(from_state.condition for from_state in chart if not isclass(from_state)):
-            raise ChartSyntaxError(f'{chart_name}: Conditions `()` do nothing at the root level')
-        if any(from_state.effect for from_state in chart if not isclass(from_state)):
-            raise ChartSyntaxError(f'{chart_name}: Effects `[]` do nothing at the root level')
+        # Index from stored value and State class to State class for O(1) hydration
+        self.state_index = {}
+        for state_class in state_classes:
+            self.state_index[state_class.value] = state_class
+            self.state_index[state_class] = state_class
+
+        # Integer codes for storing states in arrays, in declaration order
+        self.state_codes = {
+            state_class.value: code
+            for code, state_class in enumerate(state_classes)
+        }
+
+        # Charts compiled from data by `ChartBuilder` come with their plans
+        plans = class_attrs.get('_plans')
+        if plans is not None:
+            self.plans = plans
+            self.transitions = {
+                from_state: { to_value: plan.transition for to_value, plan in to_plans.items() }
+                for from_state, to_plans in plans.items()
+            }
+        else:
+            # Extract the possible transitions from the Chart class body, with validation
+            self.transitions = {}
+            chart = class_attrs.get('chart', {})
+            if type(chart) is not dict:
+                raise ChartSyntaxError(f'{chart_name}: chart must be a dict, not a {type(chart)}')
+            if any(from_state is Ellipsis for from_state in chart):
+                raise ChartSyntaxError(f'{chart_name}: Ellipsis `...` does nothing at the root level')
+            if any(from_state.condition for from_state in chart if not isclass(from_state)):
+                raise ChartSyntaxError(f'{chart_name}: Conditions `()` do nothing at the root level')
+            if any(from_state.effect for from_state in chart if not isclass(from_state)):
+                raise ChartSyntaxError(f'{chart_name}: Effects `[]` do nothing at the root level')
         
-        # Process chart structure deeply into transitions, with validation
-        all_to_states = set()
-        deep_chart = [(k, v) for k, v in chart.items()]
-        while len(deep_chart) > 0:
-            from_state, to_states = deep_chart.pop(0)
-            if not isinstance(from_state, State) and not issubclass(from_state, State):
-                raise ChartSyntaxError(f'{chart_name}: All from states must be a State class or object')
-            if from_state.state not in self.states:
-                raise ChartSyntaxError(f'{chart_name}: State {from_state.value} is not defined in Chart class body')
-            if type(to_states) is dict:
-                if any(from_state.state == transition_state.state for transition_state in self.transitions):
-                    raise ChartSyntaxError(f'{chart_name}: Duplicate transitions entry `{"{}"}` for State {from_state.state}. Combine your transition entries into a single one at the root level and reference it with Ellipsis')
-                all_to_states |= set(to_state.value for to_state in to_states)
-                # Realize class States into object States when they are conditionless
-                self.transitions[from_state] = {
-                    to_state.value: to_state(conditionless=True) if isclass(to_state) else to_state
-                    for to_state in to_states
-                }
-                deep_chart.extend((k, v) for k, v in to_states.items())
-            elif to_states is not Ellipsis:
-                raise ChartSyntaxError(f'{chart_name}: All to states must be Ellipsis `...` or a transition entry `{"{}"}`')
+            # Process chart structure deeply into transitions, with validation
+            defined_states = set(state_classes)
+            declared_states = set()
+            all_to_states = set()
+            deep_chart = deque(chart.items())
+            realized = {}
+            while deep_chart:
+                from_state, to_states = deep_chart.popleft()
+                if not isinstance(from_state, State) and not issubclass(from_state, State):
+                    raise ChartSyntaxError(f'{chart_name}: All from states must be a State class or object')
+                if from_state.state not in defined_states:
+                    raise ChartSyntaxError(f'{chart_name}: State {from_state.value} is not defined in Chart class body')
+                if type(to_states) is dict:
+                    if from_state.state in declared_states:
+                        raise ChartSyntaxError(f'{chart_name}: Duplicate transitions entry `{"{}"}` for State {from_state.state}. Combine your transition entries into a single one at the root level and reference it with Ellipsis')
+                    declared_states.add(from_state.state)
+                    # Realize class States into object States when they are conditionless,
+                    # sharing one for every transition to the same State
+                    entry = self.transitions[from_state] = {
+                        to_state.value: realized.get(to_state) or realized.setdefault(to_state, to_state(conditionless=True))
+                        if isclass(to_state) else to_state
+                        for to_state in to_states
+                    }
+                    all_to_states.update(entry)
+                    deep_chart.extend(to_states.items())
+                elif to_states is not Ellipsis:
+                    raise ChartSyntaxError(f'{chart_name}: All to states must be Ellipsis `...` or a transition entry `{"{}"}`')
         
-        # Verify every to_state was once declared as a from_state    
-        for state_name in all_to_states:
-            transition_names = [transition.value for transition in self.transitions.keys()]
-            if state_name not in transition_names:
+            # Verify every to_state was once declared as a from_state
+            missing_states = all_to_states - set(state.value for state in declared_states)
+            if missing_states:
+                state_name = sorted(missing_states)[0]
                 raise ChartSyntaxError(f'{chart_name}: Missing transition entry `{"{}"}` for State {state_name}')
 
+            # Plan every transition so nothing is resolved per call. Each plan is compiled
+            # on first use, so importing a large Chart only pays for checking State hooks.
+            for state_class in state_classes:
+                TransitionPlan.check_hooks(state_class)
+            self.plans = {
+                from_state.state: TransitionPlan.deferred(from_state.state, to_states)
+                for from_state, to_states in self.transitions.items()
+            }
+        self.initial_state = next(iter(self.plans), None)
+
+        # Graph facts that take linear time are found now, reachability on first use
+        self._successors = graph.successors(self)
+        self.terminal_states = tuple(
+            state_class
+            for state_class, children in zip(self.states, self._successors)
+            if not children
+        )
+        self.unreachable_states = graph.unreachable_states(self)
+
         return super().__init__(chart_name, class_extends, class_attrs, **kwargs)
 
+def subchart_class(state_class):
+    """Get the Chart class of a State's sub-chart, importing it on first use if it is a path"""
+    cached = state_class.__dict__.get('_subchart_class')
+    if cached is not None:
+        return cached
+    subchart = state_class.subchart
+    if type(subchart) is str:
+        try:
+            subchart = import_reference(subchart)
+        except (ImportError, AttributeError, ValueError):
+            raise ChartSyntaxError(f'{state_class}: Could not find sub-chart "{state_class.subchart}"')
+    if not (isclass(subchart) and issubclass(subchart, Chart)):
+        raise ChartSyntaxError(f'{state_class}: subchart must be a Chart class or its import path')
+    state_class._subchart_class = subchart
+    return subchart
+
+def choice_values(results):
+    """Get the (value, pretty_value) of each allowed result, raising if any were missing arguments"""
+    for result in results:
+        if result.missing:
+            raise TransitionMissingArgs(result.missing[0])
+    return tuple(
+        (result.target.value, result.target.pretty_value)
+        for result in results
+        if result.allowed
+    )
+
 class Chart(metaclass=ChartMeta):
     """
     Extend this class and define possible `States` inside.
@@ -77,6 +167,30 @@ class Chart(metaclass=ChartMeta):
     for readability, so in other transitions that change to that state,
     use Ellipses `...` to reference it.
 
+    Set `short_circuit = True` on a Chart, or on `Chart` itself to apply it
+    globally, to stop evaluating `|` at the first passing `Condition` and `&`
+    at the first blocking one.
+
+    Set `locks = StripedLocks()` on a Chart to share stateful objects between
+    threads. Transitions are still evaluated without locking, but only commit
+    if the state hasn't changed since, raising `TransitionConflict` otherwise.
+
+    A State with a `subchart` stores composite values like `PAYMENT.AUTHORIZED`.
+    Use composite targets like `to('PAYMENT.CAPTURED')`, which `ato`, `can`,
+    `explain`, `next_state` and `allowed` accept too, to transition inside it
+    with the `locks`, `journal` and `metrics` of this Chart. The sub-chart
+    bound by `subchart` uses its own.
+
+    Set `slotted = True` on a Chart to bind many objects cheaply. Its Chart
+    objects then only hold the stateful object and its `Storage`, with no
+    `__dict__` or weak references. Define `__slots__` on it to add attributes.
+
+    Set `journal` to a callable, such as a `JournalWriter`, to receive a
+    `JournalEntry` with the stored values before and after every transition
+    made or refused by `to`, `ato`, `to_path`, `route_to` and `bulk_to`,
+    though not by `to_many`.
+    Set `metrics = ChartMetrics()` to time and count them per transition.
+
     ```python
     class Example(Chart):
         class ALPHA(State): pass
@@ -90,105 +204,700 @@ class Chart(metaclass=ChartMeta):
         }
     ```
     """
+    __slots__ = ('obj', 'storage')
     chart = {}
+    slotted = False
+    short_circuit = False
+    locks = None
+    journal = None
+    metrics = None
 
-    def __init__(self, stateful_object, state_attribute='state'):
+    def __init__(self, stateful_object, state_attribute='state', storage=None):
         """
-        Create a new Chart to transform the external state of an object or dict.
+        Create a new Chart to transform the external state of an object or dict,
+        or of anything else through a `Storage` such as a database row by key.
         The external state will be initialized to the first State in the Chart if it has not been set.
         """
-        def obj_getter():
-            return getattr(stateful_object, state_attribute)
-        def obj_setter(value):
-            setattr(stateful_object, state_attribute, value)
-        
-        def dict_getter():
-            return stateful_object[state_attribute]
-        def dict_setter(value):
-            stateful_object[state_attribute] = value
-        
-        self.getter = dict_getter if type(stateful_object) is dict else obj_getter
-        self.setter = dict_setter if type(stateful_object) is dict else obj_setter
-        if self.state is None and len(self.transitions.keys()) > 0:
-            self.state = list(self.transitions.keys())[0]
-        
+        if storage is None:
+            storage = default_storage(stateful_object, state_attribute)
         self.obj = stateful_object
+        self.storage = storage
+        if storage.get(stateful_object) is None and self.initial_state is not None:
+            storage.set(stateful_object, self.stored_value(self.initial_state))
 
     @property
     def state(self):
         """
         Get the current state in hydrated form, with validation to ensure it is a possible state
         """
-        value = self.getter()
+        value = self.storage.get(self.obj)
         if value is None:
             return value
         try:
-            return self.states[self.state_values.index(value)]
-        except ValueError:
+            return self.state_index[value]
+        except (KeyError, TypeError):
+            pass
+        state_class = self.composite_state(value)
+        if state_class is None:
             raise LeveeException(f'{self.obj}: Refusing to get unknown state "{value}"')
+        return state_class
         
     @state.setter
     def state(self, value):
         """
         Set the current state to the dehydrated form
         """
-        self.setter(value.value)
+        self.storage.set(self.obj, self.stored_value(value.state))
+
+    @property
+    def subchart(self):
+        """
+        Get the sub-chart of the current State bound to the same object,
+        or None if the current State doesn't have one
+        """
+        state_class = self.state
+        if state_class is None or state_class.subchart is None:
+            return None
+        return self.bind_subchart(state_class)
+
+    def bind_subchart(self, state_class):
+        return subchart_class(state_class)(self.obj, storage=SubchartStorage(self.storage, state_class.value))
+
+    def locate(self, state, prefix=''):
+        """
+        Get the Chart that makes a transition to `state` from the current State, this one
+        or a sub-chart bound to the same object, with the State to transition to within it
+        and the prefix of the sub-chart's values inside the stored value, like `PAYMENT.`
+        """
+        if type(state) is not str or '.' not in state:
+            return self, state, prefix
+        current = self.state
+        target = self.subchart_target(current, state)
+        return self.bind_subchart(current).locate(target[1], f'{prefix}{current.value}.')
+
+    @classmethod
+    def subchart_target(cls, current, state):
+        """
+        Get the sub-chart class of the current State and the rest of a composite target
+        like `PAYMENT.CAPTURED`, or None if the target is a State of this Chart
+        """
+        if type(state) is not str or '.' not in state:
+            return None
+        prefix, _, rest = state.partition('.')
+        if current is None or current.value != prefix or current.subchart is None:
+            raise TransitionDoesNotExist(f'{current} to {state}')
+        return subchart_class(current), rest
+
+    @classmethod
+    def stored_value(cls, state_class):
+        """
+        Get the value stored when entering a State, which for a State with a sub-chart
+        includes the sub-chart's initial State, like `PAYMENT.PENDING`
+        """
+        if state_class.subchart is None:
+            return state_class.value
+        values = cls.__dict__.get('_stored_values')
+        if values is None:
+            values = cls._stored_values = {}
+        value = values.get(state_class)
+        if value is None:
+            child = subchart_class(state_class)
+            if child.initial_state is None:
+                raise ChartSyntaxError(f'{cls.__name__}: Sub-chart {child.__name__} of {state_class} has no States')
+            value = values[state_class] = f'{state_class.value}.{child.stored_value(child.initial_state)}'
+        return value
+
+    @staticmethod
+    def inner_value(value):
+        """Get the stored value of a sub-chart inside a composite value, or None if it hasn't started"""
+        return value.partition('.')[2] or None if type(value) is str else None
+
+    @classmethod
+    def composite_state(cls, value):
+        """
+        Get the State class of this Chart a composite stored value like `PAYMENT.AUTHORIZED`
+        is inside, or None if it isn't a valid one. Valid values are indexed as they are seen.
+        """
+        index = cls.__dict__.get('_composite_index')
+        if index is None:
+            index = cls._composite_index = {}
+        try:
+            return index[value]
+        except KeyError:
+            pass
+        except TypeError:
+            return None
+        if type(value) is not str:
+            return None
+        prefix, _, rest = value.partition('.')
+        state_class = cls.state_index.get(prefix)
+        if state_class is None or state_class.subchart is None:
+            return None
+        child = subchart_class(state_class)
+        if rest not in child.state_index and child.composite_state(rest) is None:
+            return None
+        index[value] = state_class
+        return state_class
     
-    def transition(self, state, dry_run, **kwargs):
+    @classmethod
+    def resolve(cls, state):
+        """
+        Get the State class for a stored value, State class or State object of this Chart
+        """
+        index = cls.state_index
         try:
-            new_state = self.states[self.state_values.index(str(state))]
-        except ValueError:
+            return index[state]
+        except (KeyError, TypeError):
+            pass
+        try:
+            return index[state.value]
+        except (AttributeError, KeyError, TypeError):
             raise TransitionError(f'Unknown state "{state}"')
-        
+
+    @classmethod
+    def find_plan(cls, from_state, to_state):
+        """
+        Get the `TransitionPlan` from a State class to a State of this Chart
+        """
+        new_state = cls.resolve(to_state)
         try:
-            transition = self.transitions[self.state][new_state.value]
+            return cls.plans[from_state][new_state.value]
         except KeyError:
-            raise TransitionDoesNotExist(f'{self.state} to {new_state}')
-
-        required_params = set()
-        condition = transition.condition
-        if condition:
-            required_params |= condition.required_params
-        effect = transition.effect
-        if effect:
-            required_params |= effect.required_params
-        for param in required_params:
-            if param not in kwargs:
-                raise TransitionMissingArgs(param)
-        
-        if condition:
-            condition_result = condition.eval(**{
-                key: value
-                for key, value in kwargs.items()
-                if key in condition.params
-            })
-            if condition_result != True: # Strings used in error message
-                raise TransitionNotAllowed(condition_result)
+            raise TransitionDoesNotExist(f'{from_state} to {new_state}')
+
+    @classmethod
+    def write(cls, stateful_object, storage, expected, value):
+        """
+        Write a state value to a `Storage`, or with `locks` or an atomic `Storage`,
+        only if it is still `expected`. Returns whether it was written.
+        """
+        locks = cls.locks
+        if locks is not None:
+            return locks.compare_and_set(stateful_object, storage, expected, value)
+        if storage.atomic:
+            return storage.compare_and_set(stateful_object, expected, value)
+        storage.set(stateful_object, value)
+        return True
+
+    def commit(self, chart, current, target):
+        """
+        Write the stored value of `target` through `chart`, this Chart or a sub-chart it located,
+        with this Chart's `locks`
+        """
+        expected = current.value
+        if current.subchart is not None:
+            # Leaving a State with a sub-chart from wherever it is inside it
+            stored = chart.storage.get(chart.obj)
+            if type(stored) is str and stored.startswith(f'{expected}.'):
+                expected = stored
+        if not self.write(chart.obj, chart.storage, expected, chart.stored_value(target)):
+            raise TransitionConflict(f'{self.obj}: State changed from {current} during transition to {target}')
+
+    def stored_source(self, current, prefix=''):
+        """Get the stored value a transition starts from, reading it again only when it is composite"""
+        if prefix or current is not None and current.subchart is not None:
+            return self.storage.get(self.obj)
+        return current.value if current is not None else None
+
+    def journal_entry(self, source, target, kwargs, started, error=None):
+        if error is None:
+            reason = None
+        elif isinstance(error, TransitionNotAllowed):
+            reason = str(error)
+        else:
+            reason = f'{error.__class__.__name__}: {error}'
+        return JournalEntry(
+            self.storage.key(self.obj),
+            source,
+            target,
+            digest(kwargs),
+            time(),
+            perf_counter() - started,
+            reason,
+        )
+
+    def transition(self, state, dry_run, **kwargs):
+        # Transitions inside a sub-chart are made with the hooks of this Chart
+        chart, state, prefix = self.locate(state)
+        current = chart.state
+        apply = self.apply if dry_run or self.metrics is None else self.measured_apply
+        journal = self.__class__.journal
+        if journal is None or dry_run:
+            return apply(chart, current, state, dry_run, kwargs, prefix)
+        started = perf_counter()
+        source = self.stored_source(current, prefix)
+        try:
+            target = apply(chart, current, state, False, kwargs, prefix)
+        except TransitionError as error:
+            journal(self.journal_entry(source, f'{prefix}{getattr(state, "value", state)}', kwargs, started, error))
+            raise
+        journal(self.journal_entry(source, prefix + chart.stored_value(target), kwargs, started))
+        return target
+
+    def apply(self, chart, current, state, dry_run, kwargs, prefix=''):
+        plan = chart.find_plan(current, state)
+        if plan.is_async and not dry_run:
+            raise TransitionError(f'{plan.source} to {plan.target} has async Conditions or Effects, use `ato`')
+        result = plan.evaluate(kwargs, chart.short_circuit)
+        if result.missing:
+            raise TransitionMissingArgs(result.missing[0])
+        if not result.allowed:
+            raise TransitionNotAllowed(result.reason)
         
         if not dry_run:
-            self.state = new_state
-            if effect:
-                effect.exec(**{
-                    key: value
-                    for key, value in kwargs.items()
-                    if key in effect.params
-                })
+            self.commit(chart, current, plan.target)
+            plan.exec(kwargs)
             
-        return new_state
+        return plan.target
     
+    def measured_apply(self, chart, current, state, dry_run, kwargs, prefix=''):
+        """Make a transition like `apply`, recording it in `metrics`"""
+        started = perf_counter()
+        plan = chart.find_plan(current, state)
+        if plan.is_async:
+            raise TransitionError(f'{plan.source} to {plan.target} has async Conditions or Effects, use `ato`')
+        found = perf_counter()
+        result = plan.evaluate(kwargs, chart.short_circuit)
+        evaluated = perf_counter()
+        self.measured_commit(chart, current, plan, result, found - started, evaluated - found, prefix)
+        plan.exec(kwargs)
+        self.metrics.record(plan, found - started, evaluated - found, perf_counter() - evaluated, prefix=prefix)
+        return plan.target
+
+    def measured_commit(self, chart, current, plan, result, lookup, condition, prefix=''):
+        """Commit a measured transition, recording it in `metrics` if it can't be made"""
+        metrics = self.metrics
+        if not result.allowed:
+            metrics.record(plan, lookup, condition, reason=result.reason, prefix=prefix)
+            if result.missing:
+                raise TransitionMissingArgs(result.missing[0])
+            raise TransitionNotAllowed(result.reason)
+        try:
+            self.commit(chart, current, plan.target)
+        except TransitionConflict:
+            metrics.record(plan, lookup, condition, conflict=True, prefix=prefix)
+            raise
+
     def to(self, state, **kwargs):
         return self.transition(state, False, **kwargs)
 
-    def can(self, state, **kwargs):
+    def to_path(self, states, **kwargs):
+        """
+        Transition through each of `states` in turn. Every hop is checked to exist and
+        its Conditions evaluated before anything changes, so if any hop can't be made
+        the state is left alone and no Effects run. Otherwise the final State is
+        written once and the Effects of every hop run in order.
+        """
+        return self.transition_path(self.state, states, kwargs)
+
+    def route_to(self, state, **kwargs):
+        """
+        Transition to a State along the fewest transitions whose Conditions pass,
+        like `to_path` with the path found by `path_to`
+        """
+        current = self.state
+        target = self.resolve(state)
+        context = EvaluationContext(kwargs)
+        path = graph.path_to(self.__class__, current, target, kwargs, self.short_circuit, context)
+        if path is None:
+            if not (current is target or self.can_reach(current, target)):
+                raise TransitionDoesNotExist(f'{current} to {target}')
+            raise TransitionNotAllowed(f'No allowed path from {current} to {target}')
+        return self.transition_path(current, path[1:], kwargs, context)
+
+    def transition_path(self, current, states, kwargs, context=None):
+        journal = self.__class__.journal
+        started = perf_counter()
         try:
-            self.transition(state, True, **kwargs)
-        except TransitionNotAllowed:
-            return False
-        return True
+            plans = self.apply_path(current, states, kwargs, context)
+        except TransitionError as error:
+            if journal is not None:
+                target = states[-1] if states else current
+                journal(self.journal_entry(self.stored_source(current), getattr(target, 'value', target), kwargs, started, error))
+            raise
+        if journal is not None:
+            # One entry per hop, so every entry is a transition of the Chart when replayed
+            source = self.stored_source(current)
+            for plan in plans:
+                target = self.stored_value(plan.target)
+                journal(self.journal_entry(source, target, kwargs, started))
+                source = target
+        return plans[-1].target if plans else current
+
+    def apply_path(self, current, states, kwargs, context=None):
+        plans = []
+        lookups = []
+        source = current
+        for state in states:
+            started = perf_counter()
+            plan = self.find_plan(source, state)
+            lookups.append(perf_counter() - started)
+            if plan.is_async:
+                raise TransitionError(f'{plan.source} to {plan.target} has async Conditions or Effects, use `ato`')
+            plans.append(plan)
+            source = plan.target
+        if not plans:
+            return ()
+
+        if context is None:
+            context = EvaluationContext(kwargs)
+        metrics = self.metrics
+        durations = []
+        for plan, lookup in zip(plans, lookups):
+            started = perf_counter()
+            result = plan.evaluate(kwargs, self.short_circuit, context)
+            durations.append(perf_counter() - started)
+            if not result.allowed:
+                if metrics is not None:
+                    metrics.record(plan, lookup, durations[-1], reason=result.reason)
+                if result.missing:
+                    raise TransitionMissingArgs(result.missing[0])
+                raise TransitionNotAllowed(result.reason)
+
+        self.commit(self, current, plans[-1].target)
+        for plan, lookup, duration in zip(plans, lookups, durations):
+            started = perf_counter()
+            plan.exec(kwargs)
+            if metrics is not None:
+                metrics.record(plan, lookup, duration, perf_counter() - started)
+        return tuple(plans)
+
+    async def atransition(self, state, dry_run, **kwargs):
+        chart, state, prefix = self.locate(state)
+        current = chart.state
+        aapply = self.aapply if dry_run or self.metrics is None else self.measured_aapply
+        journal = self.__class__.journal
+        if journal is None or dry_run:
+            return await aapply(chart, current, state, dry_run, kwargs, prefix)
+        started = perf_counter()
+        source = self.stored_source(current, prefix)
+        try:
+            target = await aapply(chart, current, state, False, kwargs, prefix)
+        except TransitionError as error:
+            journal(self.journal_entry(source, f'{prefix}{getattr(state, "value", state)}', kwargs, started, error))
+            raise
+        journal(self.journal_entry(source, prefix + chart.stored_value(target), kwargs, started))
+        return target
+
+    async def aapply(self, chart, current, state, dry_run, kwargs, prefix=''):
+        plan = chart.find_plan(current, state)
+        result = await plan.aevaluate(kwargs, chart.short_circuit)
+        if result.missing:
+            raise TransitionMissingArgs(result.missing[0])
+        if not result.allowed:
+            raise TransitionNotAllowed(result.reason)
+
+        if not dry_run:
+            self.commit(chart, current, plan.target)
+            await plan.aexec(kwargs)
+
+        return plan.target
+
+    async def measured_aapply(self, chart, current, state, dry_run, kwargs, prefix=''):
+        """Make a transition like `aapply`, recording it in `metrics`"""
+        started = perf_counter()
+        plan = chart.find_plan(current, state)
+        found = perf_counter()
+        result = await plan.aevaluate(kwargs, chart.short_circuit)
+        evaluated = perf_counter()
+        self.measured_commit(chart, current, plan, result, found - started, evaluated - found, prefix)
+        await plan.aexec(kwargs)
+        self.metrics.record(plan, found - started, evaluated - found, perf_counter() - evaluated, prefix=prefix)
+        return plan.target
+
+    async def ato(self, state, **kwargs):
+        """
+        Transition like `to`, awaiting any async Conditions or Effects
+        """
+        return await self.atransition(state, False, **kwargs)
+
+    def explain(self, state, **kwargs):
+        """
+        Evaluate a transition without raising for blocked transitions or
+        missing arguments, returning a `TransitionResult`
+        """
+        chart, state, _ = self.locate(state)
+        return chart.find_plan(chart.state, state).evaluate(kwargs, chart.short_circuit)
+
+    def can(self, state, **kwargs):
+        result = self.explain(state, **kwargs)
+        if result.missing:
+            raise TransitionMissingArgs(result.missing[0])
+        return result.allowed
+
+    def explain_choices(self, executor=None, **kwargs):
+        """
+        Evaluate every transition away from the current State without raising,
+        returning a `TransitionResult` for each in the order they were declared.
+        A Condition used by several transitions is evaluated at most once.
+        With a `concurrent.futures.Executor`, every distinct Condition they use is
+        evaluated once, in parallel, and short circuiting does not apply.
+        """
+        plans = tuple(self.plans.get(self.state, {}).values())
+        context = EvaluationContext(kwargs)
+        if executor is None:
+            short_circuit = self.short_circuit
+            return tuple(plan.evaluate(kwargs, short_circuit, context) for plan in plans)
+
+        operands = shared_operands(plans, kwargs)
+        for operand in operands.values():
+            if operand.is_async:
+                raise TransitionError(f'{operand} is async, use `achoices` instead of an executor')
+        futures = [executor.submit(context.eval, operand) for operand in operands.values()]
+        for future in futures:
+            future.result()
+        return tuple(plan.evaluate(kwargs, context=context) for plan in plans)
     
-    def choices(self, **kwargs):
-        return tuple(
-            (state_class.value, state_class.pretty_value)
-            for state_class in self.transitions[self.state].values()
-            if self.can(state_class.value, **kwargs)
-        )
\ No newline at end of file
+    def choices(self, executor=None, **kwargs):
+        return choice_values(self.explain_choices(executor, **kwargs))
+
+    async def aexplain(self, state, **kwargs):
+        """
+        Evaluate a transition like `explain`, awaiting any async Conditions
+        """
+        chart, state, _ = self.locate(state)
+        return await chart.find_plan(chart.state, state).aevaluate(kwargs, chart.short_circuit)
+
+    async def acan(self, state, **kwargs):
+        result = await self.aexplain(state, **kwargs)
+        if result.missing:
+            raise TransitionMissingArgs(result.missing[0])
+        return result.allowed
+
+    async def aexplain_choices(self, **kwargs):
+        """
+        Evaluate every transition away from the current State like `explain_choices`,
+        awaiting the Conditions of all of them concurrently. Unless short circuiting,
+        every distinct Condition they use is evaluated once.
+        """
+        plans = tuple(self.plans.get(self.state, {}).values())
+        context = EvaluationContext(kwargs)
+        short_circuit = self.short_circuit
+        if short_circuit:
+            return tuple(await gather(*(plan.aevaluate(kwargs, short_circuit, context) for plan in plans)))
+
+        operands = shared_operands(plans, kwargs)
+        await gather(*(context.aeval(operand) for operand in operands.values()))
+        return tuple(plan.evaluate(kwargs, context=context) for plan in plans)
+
+    async def achoices(self, **kwargs):
+        return choice_values(await self.aexplain_choices(**kwargs))
+
+    @classmethod
+    def source_state(cls, current_value):
+        """
+        Get the State class for a stored value, where None is the initial State
+        and a composite value like `PAYMENT.AUTHORIZED` is the State it is inside
+        """
+        if current_value is None:
+            if cls.initial_state is None:
+                raise TransitionError(f'{cls.__name__} has no States')
+            return cls.initial_state
+        try:
+            return cls.resolve(current_value)
+        except TransitionError:
+            state_class = cls.composite_state(current_value)
+            if state_class is None:
+                raise
+            return state_class
+
+    @classmethod
+    def next_state(cls, current_value, target, **kwargs):
+        """
+        Check a transition from a stored value without binding an object, raising like
+        `to` if it can't be made, and get the stored value it leads to.
+        Effects are not run and nothing is written, so it is safe from any thread.
+        """
+        current = cls.source_state(current_value)
+        target_in_subchart = cls.subchart_target(current, target)
+        if target_in_subchart is not None:
+            child, rest = target_in_subchart
+            return f'{current.value}.{child.next_state(cls.inner_value(current_value), rest, **kwargs)}'
+        plan = cls.find_plan(current, target)
+        result = plan.evaluate(kwargs, cls.short_circuit)
+        if result.missing:
+            raise TransitionMissingArgs(result.missing[0])
+        if not result.allowed:
+            raise TransitionNotAllowed(result.reason)
+        return cls.stored_value(plan.target)
+
+    @classmethod
+    def allowed(cls, current_value, **kwargs):
+        """
+        Get the stored values of every State allowed after a stored value without binding
+        an object, in declaration order, raising like `choices` for missing arguments.
+        Inside a sub-chart, the values allowed within it come first.
+        """
+        current = cls.source_state(current_value)
+        plans = cls.plans.get(current, {}).values()
+        context = EvaluationContext(kwargs)
+        short_circuit = cls.short_circuit
+        values = tuple(
+            cls.stored_value(cls.state_index[value])
+            for value, _ in choice_values(tuple(plan.evaluate(kwargs, short_circuit, context) for plan in plans))
+        )
+        if current.subchart is None:
+            return values
+        inner_values = subchart_class(current).allowed(cls.inner_value(current_value), **kwargs)
+        return tuple(f'{current.value}.{value}' for value in inner_values) + values
+
+    @classmethod
+    def can_reach(cls, from_state, to_state):
+        """Whether any sequence of transitions leads from one State to another, ignoring Conditions"""
+        codes = cls.state_codes
+        from_code = codes[cls.resolve(from_state).value]
+        return bool(graph.reachability(cls)[from_code] >> codes[cls.resolve(to_state).value] & 1)
+
+    @classmethod
+    def reachable_states(cls, from_state):
+        """Get every State some sequence of transitions leads to from a State, ignoring Conditions"""
+        bitset = graph.reachability(cls)[cls.state_codes[cls.resolve(from_state).value]]
+        return tuple(state_class for code, state_class in enumerate(cls.states) if bitset >> code & 1)
+
+    @classmethod
+    def shortest_path(cls, from_state, to_state):
+        """
+        Get the States along the fewest transitions from one State to another,
+        including both, ignoring Conditions. Returns None if there is no path.
+        """
+        return graph.shortest_path(cls, cls.resolve(from_state), cls.resolve(to_state))
+
+    def path_to(self, state, **kwargs):
+        """
+        Get the States along the fewest transitions from the current State to another
+        whose Conditions pass with kwargs, including both, or None if there is none.
+        Conditions are evaluated lazily as the search reaches each transition.
+        """
+        return graph.path_to(self.__class__, self.state, self.resolve(state), kwargs, self.short_circuit)
+
+    @classmethod
+    def from_spec(cls, name, spec, references=None, **attrs):
+        """
+        Create a Chart class extending this one from plain data, see `ChartBuilder`
+        """
+        return ChartBuilder(name, cls, references, **attrs).update(spec).build()
+
+    @classmethod
+    def bulk_to(cls, stateful_objects, state, state_attribute='state', batch_effects=False, storage=None, **kwargs):
+        """
+        Transition many objects or dicts to the same State of this Chart without raising per object.
+        Objects inside a State with a sub-chart leave it from wherever they are within it.
+        Conditions are evaluated once per source State when they are `pure`, and with
+        `batch_effects` each transition's Effects run once through `Effect.exec_batch`
+        with the objects that took it. Every object's outcome is sent to `journal`.
+        With a `Storage`, the writes are made inside one `storage.transaction()`.
+        Returns a `BatchResult` for every object, in order.
+        """
+        new_state = cls.resolve(state)
+        if storage is None:
+            return cls.bulk_transition(stateful_objects, new_state, None, state_attribute, batch_effects, kwargs)
+        with storage.transaction():
+            return cls.bulk_transition(stateful_objects, new_state, storage, state_attribute, batch_effects, kwargs)
+
+    @classmethod
+    def bulk_transition(cls, stateful_objects, new_state, storage, state_attribute, batch_effects, kwargs):
+        verdicts = {}
+        moved_plans = {}
+        results = []
+        journal = cls.journal
+        arguments = digest(kwargs) if journal is not None else None
+        new_value = cls.stored_value(new_state)
+        for stateful_object in stateful_objects:
+            started = perf_counter() if journal is not None else None
+            object_storage = storage if storage is not None else default_storage(stateful_object, state_attribute)
+            value = object_storage.get(stateful_object)
+            if value is None:
+                current_state = cls.initial_state
+            else:
+                try:
+                    current_state = cls.state_index.get(value)
+                except TypeError:
+                    current_state = None
+                if current_state is None:
+                    current_state = cls.composite_state(value)
+            plan = cls.plans.get(current_state, {}).get(new_state.value)
+            if plan is None:
+                reason = f'{current_state} to {new_state}' if current_state is not None \
+                    else f'Unknown state "{value}"'
+                result = BatchResult(stateful_object, BatchResult.NO_TRANSITION, current_state, reason)
+            else:
+                if plan in verdicts:
+                    verdict = verdicts[plan]
+                else:
+                    verdict = plan.evaluate(kwargs, cls.short_circuit)
+                    if verdict.missing or plan.pure:
+                        verdicts[plan] = verdict
+                if not verdict.allowed:
+                    result = BatchResult(stateful_object, BatchResult.BLOCKED, current_state, verdict.reason)
+                elif not cls.write(stateful_object, object_storage, value, new_value):
+                    result = BatchResult(stateful_object, BatchResult.CONFLICT, current_state, 'State changed during transition')
+                else:
+                    if batch_effects:
+                        moved_plans.setdefault(plan, []).append(stateful_object)
+                    else:
+                        plan.exec(kwargs)
+                    result = BatchResult(stateful_object, BatchResult.MOVED, new_state)
+            results.append(result)
+            if journal is not None:
+                source = value if value is not None or current_state is None else cls.stored_value(current_state)
+                journal(cls.batch_entry(object_storage.key(stateful_object), source, new_value, result, arguments, started))
+
+        for plan, objects in moved_plans.items():
+            plan.exec_batch(tuple(objects), kwargs)
+        return tuple(results)
+
+    @staticmethod
+    def batch_entry(key, source, target, result, arguments, started):
+        """Get the `JournalEntry` for one object's `BatchResult`, with reasons like `journal_entry`"""
+        status = result.status
+        if status == BatchResult.MOVED:
+            reason = None
+        elif status == BatchResult.BLOCKED:
+            reason = result.reason
+        elif status == BatchResult.CONFLICT:
+            reason = f'{TransitionConflict.__name__}: {result.reason}'
+        else:
+            reason = f'{TransitionDoesNotExist.__name__}: {result.reason}'
+        return JournalEntry(key, source, target, arguments, time(), perf_counter() - started, reason)
+
+    @classmethod
+    def export_metrics(cls):
+        """
+        Get the `metrics` of this Chart as plain dicts for a monitoring system,
+        or None if they aren't enabled
+        """
+        if cls.metrics is None:
+            return None
+        return { 'chart': cls.__name__, 'transitions': cls.metrics.export() }
+
+    @classmethod
+    def replay(cls, journal_path, snapshot_path=None, snapshot_every=None):
+        """
+        Rebuild object states from a `JournalWriter` file without evaluating Conditions
+        or running Effects, continuing from and updating the snapshot file if given.
+        Only objects whose `Storage` gives them a key, like `DictStorage(id_key='id')`, are replayed.
+        Returns a `Replay` whose `states` map each object key to its State value.
+        """
+        from .replay import replay_journal
+        return replay_journal(cls, journal_path, snapshot_path, snapshot_every)
+
+    @classmethod
+    def adjacency_matrix(cls):
+        """
+        Get a read-only NumPy boolean matrix indexed by `state_codes` where
+        `[from_code, to_code]` is True when that transition exists
+        """
+        from . import columnar
+        return columnar.adjacency_matrix(cls)
+
+    @classmethod
+    def to_many(cls, codes, state, mask=None, **kwargs):
+        """
+        Transition a NumPy array of `state_codes` to the same State, limited to the rows in `mask`.
+        Conditions may accept and return boolean arrays to pass or block individual rows,
+        and each transition's Effects run once if any row took it.
+        Rows have no keys, so these transitions are not sent to `journal`.
+        Returns the new codes and a boolean array of the rows that moved.
+        """
+        from . import columnar
+        return columnar.to_many(cls, codes, state, mask, **kwargs)
@@ -0,0 +1,79 @@
+try:
+    import numpy
+except ImportError:
+    numpy = None
+from .condition import ConditionalExpression
+from .exceptions import LeveeException
+
+def require_numpy():
+    if numpy is None:
+        raise LeveeException('Columnar transitions require NumPy, install it with `pip install levee[numpy]`')
+    return numpy
+
+def adjacency_matrix(chart_class):
+    """
+    Get a dense boolean matrix where `[from_code, to_code]` is True when the transition exists
+    """
+    require_numpy()
+    matrix = chart_class.__dict__.get('_adjacency')
+    if matrix is None:
+        size = len(chart_class.states)
+        matrix = numpy.zeros((size, size), dtype=bool)
+        for from_state, plans in chart_class.plans.items():
+            for to_value in plans:
+                matrix[chart_class.state_codes[from_state.value], chart_class.state_codes[to_value]] = True
+        matrix.setflags(write=False)
+        chart_class._adjacency = matrix
+    return matrix
+
+def evaluate(condition, kwargs):
+    """
+    Evaluate a Condition where any operand may return a boolean array instead of a
+    single value, returning a boolean or boolean array of the rows that pass
+    """
+    if condition is None:
+        return True
+    if not isinstance(condition, ConditionalExpression):
+        result = condition.eval(**condition.bind(kwargs))
+        if isinstance(result, numpy.ndarray):
+            return result.astype(bool, copy=False)
+        return result == True
+    if len(condition.values) == 0:
+        return True
+    if condition.operator is None:
+        return evaluate(condition.values[0], kwargs)
+    if condition.operator is condition.Operators.NOT:
+        return numpy.logical_not(evaluate(condition.values[0], kwargs))
+    left, right = (evaluate(value, kwargs) for value in condition.values)
+    if condition.operator is condition.Operators.OR:
+        return numpy.logical_or(left, right)
+    if condition.operator is condition.Operators.AND:
+        return numpy.logical_and(left, right)
+
+def to_many(chart_class, codes, state, mask=None, **kwargs):
+    """
+    Transition every row of an array of state codes to the same State.
+    Returns the new codes and a boolean array of the rows that moved.
+    """
+    require_numpy()
+    codes = numpy.asarray(codes)
+    new_state = chart_class.resolve(state)
+    new_code = chart_class.state_codes[new_state.value]
+    if codes.size and (codes.min() < 0 or codes.max() >= len(chart_class.states)):
+        raise LeveeException(f'{chart_class.__name__}: Refusing to transition unknown state codes')
+
+    allowed = adjacency_matrix(chart_class)[:, new_code][codes]
+    if mask is not None:
+        allowed &= numpy.asarray(mask, dtype=bool)
+    moved = numpy.zeros(codes.shape, dtype=bool)
+    for from_code in numpy.unique(codes[allowed]):
+        plan = chart_class.plans[chart_class.states[from_code]][new_state.value]
+        plan.check(kwargs)
+        rows = allowed & (codes == from_code) & evaluate(plan.condition, kwargs)
+        if rows.any():
+            moved |= rows
+            plan.exec(kwargs)
+
+    new_codes = codes.copy()
+    new_codes[moved] = new_code
+    return new_codes, moved
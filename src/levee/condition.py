@@ -1,4 +1,6 @@
+from asyncio import gather
 from enum import Enum
+from .context import PureCache
 from .expressions import ExpressionMeta, Operator, Equation, Operand
 
 
@@ -8,6 +10,11 @@ class ConditionMeta(ExpressionMeta):
         OR = Operator('|', 2)
         AND = Operator('&', 2)
 
+    def __init__(self, name, extends, attrs, **kwargs):
+        super().__init__(name, extends, attrs, **kwargs)
+        self.pure_cache = PureCache(self.cache_size, self.cache_ttl) \
+            if getattr(self, 'pure', False) is True and getattr(self, 'cache_size', 0) > 0 else None
+
     def __or__(self, other):
         return ConditionalExpression(self, other, operator=self.Operators.OR)
 
@@ -20,35 +27,119 @@ class ConditionMeta(ExpressionMeta):
 class ConditionalExpression(Equation, metaclass=ConditionMeta):
     calc = 'eval'
 
+    def __init__(self, *values, operator=None):
+        super().__init__(*values, operator=operator)
+        self.cost = sum(value.cost for value in self.values)
+        self.pure = all(value.pure for value in self.values)
+        # Both operators are commutative, so the cheaper side can be evaluated first
+        self.swapped = (
+            operator in (self.Operators.OR, self.Operators.AND)
+            and self.values[1].cost < self.values[0].cost
+        )
+
+    def __or__(self, other):
+        return ConditionalExpression(self, other, operator=self.Operators.OR)
+
+    def __and__(self, other):
+        return ConditionalExpression(self, other, operator=self.Operators.AND)
+
+    def __invert__(self):
+        return ConditionalExpression(self, operator=self.Operators.NOT)
+
     def eval(self, **kwargs):
-        if len(self.values) == 0:
+        return self.evaluate(kwargs)
+
+    def evaluate(self, kwargs, short_circuit=False, context=None):
+        """
+        Evaluate the expression with every operand, or in short circuit mode
+        stop at the first passing `|` operand or the first blocking `&` operand,
+        evaluating the cheapest operand first.
+        With an `EvaluationContext`, each Condition is evaluated through it.
+        The same kwargs are passed down, and each Condition takes only its own.
+        """
+        values = self.values
+        if len(values) == 0:
             return
-        eval_operand = lambda operand: operand.eval(**{
-            k: v
-            for k, v in kwargs.items()
-            if k in operand.params
-        })
+        operator = self.operator
+        if operator is None:
+            return self.evaluate_operand(values[0], kwargs, short_circuit, context)
+        if operator is self.Operators.NOT:
+            return self.evaluate_operand(values[0], kwargs, short_circuit, context) != True
+        
+        first, second = values
+        if short_circuit and self.swapped:
+            first, second = second, first
+        first_value = self.evaluate_operand(first, kwargs, short_circuit, context)
+        if short_circuit and self.stops_at(first_value):
+            return first_value
+        return self.combine(first_value, self.evaluate_operand(second, kwargs, short_circuit, context), short_circuit)
+
+    @staticmethod
+    def evaluate_operand(operand, kwargs, short_circuit, context):
+        if isinstance(operand, ConditionalExpression):
+            return operand.evaluate(kwargs, short_circuit, context)
+        if context is not None:
+            return context.eval(operand)
+        return operand.eval(**operand.bind(kwargs))
+
+    async def aevaluate(self, kwargs, short_circuit=False, context=None):
+        """
+        Evaluate the expression like `evaluate`, awaiting async operands and
+        running both sides of `|` and `&` concurrently unless short circuiting
+        """
+        if not self.is_async:
+            return self.evaluate(kwargs, short_circuit, context)
+        aevaluate_operand = self.aevaluate_operand
         if self.operator is None:
-            return eval_operand(self.values[0])
+            return await aevaluate_operand(self.values[0], kwargs, short_circuit, context)
         if self.operator is self.Operators.NOT:
-            return eval_operand(self.values[0]) != True
+            return await aevaluate_operand(self.values[0], kwargs, short_circuit, context) != True
+
+        if not short_circuit:
+            first_value, second_value = await gather(*(
+                aevaluate_operand(value, kwargs, short_circuit, context)
+                for value in self.values
+            ))
+            return self.combine(first_value, second_value)
+        first, second = self.values
+        if self.swapped:
+            first, second = second, first
+        first_value = await aevaluate_operand(first, kwargs, short_circuit, context)
+        if self.stops_at(first_value):
+            return first_value
+        return self.combine(first_value, await aevaluate_operand(second, kwargs, short_circuit, context), short_circuit)
+
+    @staticmethod
+    async def aevaluate_operand(operand, kwargs, short_circuit, context):
+        if isinstance(operand, ConditionalExpression):
+            return await operand.aevaluate(kwargs, short_circuit, context)
+        if context is not None:
+            return await context.aeval(operand)
+        return await operand.acalculate(kwargs)
+
+    def stops_at(self, value):
+        """Whether a short circuit evaluation is decided by the first operand's value"""
+        if self.operator is self.Operators.OR:
+            return value == True
+        return value != True
+
+    def combine(self, first_value, second_value, short_circuit=False):
+        """Combine the values of both operands, in evaluation order, into the result"""
+        left_value, right_value = (second_value, first_value) if short_circuit and self.swapped \
+            else (first_value, second_value)
+        
         if self.operator is self.Operators.OR:
-            left_value = eval_operand(self.values[0])
-            right_value = eval_operand(self.values[1])
             if left_value != True and right_value != True:
                 return f'{left_value} and {right_value}'
             if left_value == True:
                 return left_value
             return right_value
         if self.operator is self.Operators.AND:
-            left_value = eval_operand(self.values[0])
-            right_value = eval_operand(self.values[1])
             if left_value != True and right_value != True:
                 return f'{left_value} and {right_value}'
             if left_value != True:
                 return left_value
             return right_value
-            
 
     def __str__(self):
         if len(self.values) == 0:
@@ -56,11 +147,11 @@ class ConditionalExpression(Equation, metaclass=ConditionMeta):
         if self.operator is None:
             return str(self.values[0])
         if self.operator is self.Operators.NOT:
-            return f'{self.Operators.NOT}{self.values[0]}'
+            return f'{self.Operators.NOT.value}{self.values[0]}'
         if self.operator is self.Operators.OR:
-            return f'({self.values[0]} {self.Operators.OR} {self.values[1]})'
+            return f'({self.values[0]} {self.Operators.OR.value} {self.values[1]})'
         if self.operator is self.Operators.AND:
-            return f'({self.values[0]} {self.Operators.AND} {self.values[1]})'
+            return f'({self.values[0]} {self.Operators.AND.value} {self.values[1]})'
 
 class Condition(Operand, metaclass=ConditionMeta):
     """
@@ -79,8 +170,20 @@ class Condition(Operand, metaclass=ConditionMeta):
         TO_STATE (Condition1 & Condition2 | ~Condition3): ...
     }
     ```
+
+    Set `cost` to the relative expense of `eval` so Charts using
+    `short_circuit` evaluate cheaper `Conditions` first.
+
+    Set `pure = True` when `eval` depends only on its arguments and has no
+    side effects, so its result can be reused, such as by `Chart.bulk_to()`.
+    Results of `pure` Conditions are cached by argument values across calls,
+    keeping the `cache_size` most recent for up to `cache_ttl` seconds.
     """
     calc = 'eval'
+    cost = 1
+    pure = False
+    cache_size = 128
+    cache_ttl = None
 
     def eval(self):
         """
@@ -0,0 +1,102 @@
+from collections import OrderedDict
+from threading import Lock
+from time import monotonic
+from .exceptions import TransitionError
+
+class PureCache:
+    """
+    A bounded, thread safe LRU cache of a pure Condition's results by argument
+    values, where results older than `ttl` seconds are evaluated again
+    """
+    def __init__(self, size, ttl=None):
+        self.size = size
+        self.ttl = ttl
+        self.entries = OrderedDict()
+        self.lock = Lock()
+
+    def get(self, key):
+        """Get a cached result as a 1-tuple, or None if it is missing or expired"""
+        with self.lock:
+            entry = self.entries.get(key)
+            if entry is None:
+                return None
+            value, expires = entry
+            if expires is not None and expires <= monotonic():
+                del self.entries[key]
+                return None
+            self.entries.move_to_end(key)
+            return (value,)
+
+    def set(self, key, value):
+        expires = monotonic() + self.ttl if self.ttl is not None else None
+        with self.lock:
+            self.entries[key] = (value, expires)
+            self.entries.move_to_end(key)
+            while len(self.entries) > self.size:
+                self.entries.popitem(last=False)
+
+    def clear(self):
+        with self.lock:
+            self.entries.clear()
+
+class EvaluationContext:
+    """
+    Remembers the result of each Condition for the duration of one Chart call,
+    so a Condition used by several transitions or expressions is evaluated once.
+    Conditions marked `pure` are also remembered across calls by argument values.
+    """
+    __slots__ = ('kwargs', 'results')
+
+    def __init__(self, kwargs):
+        self.kwargs = kwargs
+        self.results = {}
+
+    def cache_key(self, operand):
+        """Get the argument values an operand takes as a cache key, or None if they are unhashable"""
+        kwargs = self.kwargs
+        key = tuple(kwargs.get(param, Ellipsis) for param in operand.param_names)
+        try:
+            hash(key)
+        except TypeError:
+            return None
+        return key
+
+    def eval(self, operand):
+        """Evaluate a Condition once per context"""
+        operand_class = operand.__class__
+        try:
+            return self.results[operand_class]
+        except KeyError:
+            pass
+        if operand.is_async:
+            raise TransitionError(f'{operand} is async, use the async Chart methods')
+        cache = operand_class.pure_cache
+        key = self.cache_key(operand) if cache is not None else None
+        cached = cache.get(key) if key is not None else None
+        if cached is not None:
+            value = cached[0]
+        else:
+            value = operand.calculate(self.kwargs)
+            if key is not None:
+                cache.set(key, value)
+        self.results[operand_class] = value
+        return value
+
+    async def aeval(self, operand):
+        """Evaluate a Condition once per context, awaiting it if it is async"""
+        operand_class = operand.__class__
+        try:
+            return self.results[operand_class]
+        except KeyError:
+            pass
+        cache = operand_class.pure_cache
+        key = self.cache_key(operand) if cache is not None else None
+        cached = cache.get(key) if key is not None else None
+        if cached is not None:
+            value = cached[0]
+        else:
+            value = await operand.acalculate(self.kwargs)
+            if key is not None:
+                cache.set(key, value)
+        self.results[operand_class] = value
+        return value
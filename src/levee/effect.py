@@ -12,21 +12,19 @@ class EffectMeta(ExpressionMeta):
 class EffectExpression(Equation, metaclass=EffectMeta):
     calc = 'exec'
 
+    def __add__(self, other):
+        return EffectExpression(self, other, operator=self.Operators.PLUS)
+
     def exec(self, **kwargs):
-        if len(self.values) == 0:
-            return
-        exec_operand = lambda operand: operand.exec(**{
-            k: v
-            for k, v in kwargs.items()
-            if k in operand.params
-        })
-        if self.operator is None:
-            exec_operand(self.values[0])
-            return
-        if self.operator is self.Operators.PLUS:
-            exec_operand(self.values[0])
-            exec_operand(self.values[1])
-            return
+        self.execute(kwargs)
+
+    def execute(self, kwargs):
+        """Execute every Effect in order, each taking only its own arguments from kwargs"""
+        for value in self.values:
+            if isinstance(value, EffectExpression):
+                value.execute(kwargs)
+            else:
+                value.exec(**value.bind(kwargs))
 
     def __str__(self):
         if len(self.values) == 0:
@@ -34,7 +32,7 @@ class EffectExpression(Equation, metaclass=EffectMeta):
         if self.operator is None:
             return str(self.values[0])
         if self.operator is self.Operators.PLUS:
-            return f'{self.values[0]} {self.Operators.PLUS} {self.values[1]}'
+            return f'{self.values[0]} {self.Operators.PLUS.value} {self.values[1]}'
 
 class Effect(Operand, metaclass=EffectMeta):
     """
@@ -48,8 +46,16 @@ class Effect(Operand, metaclass=EffectMeta):
         TO_STATE [Effect1 + Effect2 + Effect3]: ...
     }
     ```
+
+    Override `exec_batch` to handle every object moved by
+    `Chart.bulk_to(batch_effects=True)` in one call, like notifying a carrier
+    of every shipped order. It takes the objects and the same arguments as `exec`.
     """
     calc = 'exec'
 
     def exec(self):
-        pass
\ No newline at end of file
+        pass
+
+    def exec_batch(self, objects, **kwargs):
+        """Run the Effect once for the stateful objects in `objects`, by default with `exec`"""
+        self.exec(**kwargs)
\ No newline at end of file
@@ -12,4 +12,5 @@ class TransitionError(LeveeException):
 
 class TransitionDoesNotExist(TransitionError): pass
 class TransitionMissingArgs(TransitionError): pass
-class TransitionNotAllowed(TransitionError): pass
\ No newline at end of file
+class TransitionNotAllowed(TransitionError): pass
+class TransitionConflict(TransitionError): pass
@@ -1,4 +1,4 @@
-from inspect import Parameter, signature
+from inspect import Parameter, getattr_static, signature, iscoroutinefunction
 from enum import Enum
 from .exceptions import LeveeException
 
@@ -8,9 +8,16 @@ class Operator:
         self.symbol = symbol
         self.operands = operands
 
+    def __str__(self):
+        return self.symbol
+
 class ExpressionBase:
     calc = None
     _calc_kwargs = False
+    _params = frozenset()
+    _required_params = frozenset()
+    param_names = ()
+    is_async = False
 
     def __init__(self, *args, **kwargs):
         self.Operators = self.__class__.Operators
@@ -20,11 +27,11 @@ class ExpressionBase:
 
     @property
     def params(self):
-        return set()
+        return self._params
     
     @property
     def required_params(self):
-        return set()
+        return self._required_params
 
 class ExpressionMeta(type):
     class Operators(Enum): pass
@@ -43,6 +50,26 @@ class ExpressionMeta(type):
             ):
                 raise LeveeException(f'{name}: Parameters for `{self.calc}` must be must be passable by keyword and non-variable')
 
+            # Introspect once here so evaluating an Operand never has to
+            if calc_fn is not None:
+                self.is_async = iscoroutinefunction(calc_fn)
+                params = tuple(signature(calc_fn).parameters.values())
+                # Plain functions looked up on the class still take `self`
+                if not isinstance(getattr_static(self, self.calc), (staticmethod, classmethod)):
+                    params = params[1:]
+                keyword_params = tuple(
+                    param
+                    for param in params
+                    if param.kind in (Parameter.POSITIONAL_OR_KEYWORD, Parameter.KEYWORD_ONLY)
+                )
+                self._params = frozenset(param.name for param in keyword_params)
+                self.param_names = tuple(sorted(self._params))
+                self._required_params = frozenset(
+                    param.name
+                    for param in keyword_params
+                    if param.default is Parameter.empty
+                )
+
         return super().__init__(name, extends, attrs, **kwargs)
     
     def __str__(self):
@@ -67,39 +94,34 @@ class Equation(ExpressionBase):
                 raise ValueError(operator, values)
         self.operator = operator
         self.values = tuple(value() for value in values)
+        self._params = frozenset().union(*(value.params for value in self.values))
+        self._required_params = frozenset().union(*(value.required_params for value in self.values))
+        self.param_names = tuple(sorted(self._params))
+        self.is_async = any(value.is_async for value in self.values)
     
     def __bool__(self):
         return len(self.values) > 0
-    
-    @property
-    def params(self):
-        params = set()
-        for value in self.values:
-            params |= value.params
-        return params
-    
-    @property
-    def required_params(self):
-        required_params = set()
-        for value in self.values:
-            required_params |= value.required_params
-        return required_params
 
 class Operand(ExpressionBase):
 
-    @property
-    def params(self):
-        return set(
-            param.name
-            for param in signature(getattr(self, self.calc)).parameters.values()
-            if param.kind in (Parameter.POSITIONAL_OR_KEYWORD, Parameter.KEYWORD_ONLY)
-        )
-    
-    @property
-    def required_params(self):
-        return set(
-            param.name
-            for param in signature(getattr(self, self.calc)).parameters.values()
-            if param.kind in (Parameter.POSITIONAL_OR_KEYWORD, Parameter.KEYWORD_ONLY)
-            if param.default is Parameter.empty
-        )
\ No newline at end of file
+    def bind(self, kwargs):
+        """Get the arguments `calc` takes from kwargs"""
+        return {
+            name: kwargs[name]
+            for name in self.param_names
+            if name in kwargs
+        }
+
+    def calculate(self, kwargs):
+        """Call `calc` with the arguments it takes from kwargs"""
+        return getattr(self, self.calc)(**self.bind(kwargs))
+
+    async def acalculate(self, kwargs):
+        """Call `calc` like `calculate`, awaiting it if it is async"""
+        result = self.calculate(kwargs)
+        if self.is_async:
+            return await result
+        return result
+
+    def __str__(self):
+        return str(self.__class__)
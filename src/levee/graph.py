@@ -0,0 +1,168 @@
+from collections import deque
+from .context import EvaluationContext
+
+def successors(chart_class):
+    """Get the codes of the States each State can transition to, indexed by `state_codes`"""
+    codes = chart_class.state_codes
+    return [
+        [codes[to_value] for to_value in chart_class.plans.get(state_class, ())]
+        for state_class in chart_class.states
+    ]
+
+def unreachable_states(chart_class):
+    """Get the States that no sequence of transitions leads to from the initial State"""
+    adjacency = chart_class._successors
+    initial_state = chart_class.initial_state
+    if initial_state is None:
+        return chart_class.states
+    seen = bytearray(len(adjacency))
+    start = chart_class.state_codes[initial_state.value]
+    seen[start] = 1
+    stack = [start]
+    while stack:
+        for child in adjacency[stack.pop()]:
+            if not seen[child]:
+                seen[child] = 1
+                stack.append(child)
+    return tuple(state_class for code, state_class in enumerate(chart_class.states) if not seen[code])
+
+def strongly_connected(adjacency):
+    """
+    Tarjan's algorithm without recursion, so large charts can't overflow the stack.
+    Yields each component after every component reachable from it.
+    """
+    count = len(adjacency)
+    index = [None] * count
+    low = [0] * count
+    on_stack = bytearray(count)
+    stack = []
+    counter = 0
+    for root in range(count):
+        if index[root] is not None:
+            continue
+        index[root] = low[root] = counter
+        counter += 1
+        stack.append(root)
+        on_stack[root] = 1
+        work = [(root, iter(adjacency[root]))]
+        while work:
+            node, children = work[-1]
+            for child in children:
+                if index[child] is None:
+                    index[child] = low[child] = counter
+                    counter += 1
+                    stack.append(child)
+                    on_stack[child] = 1
+                    work.append((child, iter(adjacency[child])))
+                    break
+                if on_stack[child] and index[child] < low[node]:
+                    low[node] = index[child]
+            else:
+                work.pop()
+                if work:
+                    parent = work[-1][0]
+                    if low[node] < low[parent]:
+                        low[parent] = low[node]
+                if low[node] == index[node]:
+                    component = []
+                    while True:
+                        member = stack.pop()
+                        on_stack[member] = 0
+                        component.append(member)
+                        if member == node:
+                            break
+                    yield component
+
+def path_to(chart_class, from_state, to_state, kwargs, short_circuit=False, context=None):
+    """
+    Get the fewest States from one State to another through transitions whose Conditions
+    pass, or None. Conditions are only evaluated for transitions the search reaches,
+    and never for transitions to States that can't lead to the target.
+    """
+    if from_state is to_state:
+        return (from_state,)
+    codes = chart_class.state_codes
+    bitsets = reachability(chart_class)
+    goal = codes[to_state.value]
+    if not bitsets[codes[from_state.value]] >> goal & 1:
+        return None
+    if context is None:
+        context = EvaluationContext(kwargs)
+    previous = { from_state: None }
+    queue = deque((from_state,))
+    while queue and to_state not in previous:
+        node = queue.popleft()
+        for plan in chart_class.plans.get(node, {}).values():
+            child = plan.target
+            if child in previous:
+                continue
+            if child is not to_state and not bitsets[codes[child.value]] >> goal & 1:
+                continue
+            if not plan.evaluate(kwargs, short_circuit, context).allowed:
+                continue
+            previous[child] = node
+            if child is to_state:
+                break
+            queue.append(child)
+    if to_state not in previous:
+        return None
+    path = []
+    node = to_state
+    while node is not None:
+        path.append(node)
+        node = previous[node]
+    return tuple(reversed(path))
+
+def reachability(chart_class):
+    """
+    Get, for each State code, an int whose bit `code` is set for every State reachable
+    from it through one or more transitions. Computed once per Chart class, in time
+    linear in the number of transitions apart from the bitwise ors.
+    """
+    bitsets = chart_class.__dict__.get('_reachability')
+    if bitsets is None:
+        adjacency = chart_class._successors
+        component_of = [0] * len(adjacency)
+        component_reach = []
+        for number, component in enumerate(strongly_connected(adjacency)):
+            members = 0
+            for member in component:
+                component_of[member] = number
+                members |= 1 << member
+            reach = 0
+            for member in component:
+                for child in adjacency[member]:
+                    child_component = component_of[child]
+                    # Components are numbered after everything they reach, so earlier numbers are done
+                    if child_component == number:
+                        reach |= members
+                    else:
+                        reach |= 1 << child | component_reach[child_component]
+            component_reach.append(reach)
+        bitsets = tuple(component_reach[component_of[code]] for code in range(len(adjacency)))
+        chart_class._reachability = bitsets
+    return bitsets
+
+def shortest_path(chart_class, from_state, to_state):
+    """Get the fewest States from one State to another, ignoring Conditions, or None"""
+    codes = chart_class.state_codes
+    start, goal = codes[from_state.value], codes[to_state.value]
+    if start == goal:
+        return (chart_class.states[start],)
+    if not reachability(chart_class)[start] >> goal & 1:
+        return None
+    adjacency = chart_class._successors
+    previous = { start: None }
+    queue = deque((start,))
+    while goal not in previous:
+        node = queue.popleft()
+        for child in adjacency[node]:
+            if child not in previous:
+                previous[child] = node
+                queue.append(child)
+    path = []
+    node = goal
+    while node is not None:
+        path.append(chart_class.states[node])
+        node = previous[node]
+    return tuple(reversed(path))
@@ -0,0 +1,125 @@
+import atexit
+import json
+from hashlib import blake2b
+from threading import Event, Lock, Thread
+
+class JournalEntry:
+    """
+    A record of one transition attempt, given to `Chart.journal`.
+    `reason` is None when the transition was made.
+    """
+    __slots__ = ('key', 'source', 'target', 'digest', 'timestamp', 'duration', 'reason')
+
+    def __init__(self, key, source, target, digest, timestamp, duration, reason=None):
+        self.key = key
+        self.source = source
+        self.target = target
+        self.digest = digest
+        self.timestamp = timestamp
+        self.duration = duration
+        self.reason = reason
+
+    def data(self):
+        """Get the entry as a list in the order of `__slots__`"""
+        return [self.key, self.source, self.target, self.digest, self.timestamp, self.duration, self.reason]
+
+    @classmethod
+    def from_data(cls, data):
+        return cls(*data)
+
+    def __repr__(self):
+        return f'<JournalEntry {self.key} {self.source} to {self.target}>'
+
+SCALAR_TYPES = frozenset((str, int, float, bool, type(None)))
+
+def digest(kwargs):
+    """
+    Get a short digest of transition arguments without keeping them, the same in
+    every process. Only scalar values are included, other arguments by their type.
+    """
+    if not kwargs:
+        return None
+    parts = []
+    for name in sorted(kwargs):
+        value = kwargs[name]
+        value_type = type(value)
+        if value_type in SCALAR_TYPES:
+            parts.append(f'{name}={value_type.__name__}:{value!r}')
+        else:
+            parts.append(f'{name}:{value_type.__module__}.{value_type.__qualname__}')
+    return blake2b('\0'.join(parts).encode(), digest_size=8).hexdigest()
+
+def ends_line(path):
+    """Whether a file is empty or ends with a complete line"""
+    with open(path, 'rb') as file:
+        if not file.seek(0, 2):
+            return True
+        file.seek(-1, 2)
+        return file.read(1) == b'\n'
+
+class JournalWriter:
+    """
+    A journal that buffers entries in memory and appends them to a JSON lines
+    file from a background thread, whenever `buffer_size` entries are waiting
+    and at least every `flush_interval` seconds. Call `close()` to write the rest,
+    which also happens when the interpreter exits.
+    """
+    def __init__(self, path, buffer_size=1024, flush_interval=1.0):
+        self.path = path
+        self.buffer_size = buffer_size
+        self.flush_interval = flush_interval
+        self.entries = []
+        self.lock = Lock()
+        self.write_lock = Lock()
+        self.wake = Event()
+        self.closed = False
+        self.file = open(path, 'a', encoding='utf-8')
+        if not ends_line(path):
+            # Don't append to a line left incomplete by a process that crashed writing it
+            self.file.write('\n')
+        self.thread = Thread(target=self.run, name='levee-journal', daemon=True)
+        self.thread.start()
+        atexit.register(self.close)
+
+    def __call__(self, entry):
+        with self.lock:
+            entries = self.entries
+            entries.append(entry)
+            full = len(entries) >= self.buffer_size
+        if full:
+            self.wake.set()
+
+    def run(self):
+        while not self.closed:
+            self.wake.wait(self.flush_interval)
+            self.wake.clear()
+            self.flush()
+
+    def flush(self):
+        with self.lock:
+            entries, self.entries = self.entries, []
+        if not entries:
+            return
+        lines = ''.join(
+            json.dumps(entry.data(), separators=(',', ':'), default=str) + '\n'
+            for entry in entries
+        )
+        with self.write_lock:
+            self.file.write(lines)
+            self.file.flush()
+
+    def close(self):
+        if self.closed:
+            return
+        self.closed = True
+        self.wake.set()
+        self.thread.join()
+        self.flush()
+        self.file.close()
+        atexit.unregister(self.close)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
@@ -0,0 +1,53 @@
+from threading import Lock
+
+class StripedLocks:
+    """
+    A fixed number of locks shared between stateful objects by identity,
+    so any number of objects can be locked with bounded memory.
+    Counters are kept per stripe and only changed while holding its lock.
+    """
+    def __init__(self, stripes=64):
+        if stripes < 1:
+            raise ValueError('StripedLocks needs at least one stripe')
+        self.locks = tuple(Lock() for _ in range(stripes))
+        self.acquired = [0] * stripes
+        self.contended = [0] * stripes
+        self.conflicts = [0] * stripes
+
+    def stripe(self, obj):
+        # Object addresses are aligned, so the lowest bits would crowd a few stripes
+        return (id(obj) >> 4) % len(self.locks)
+
+    def compare_and_set(self, obj, storage, expected, value):
+        """
+        Set the state value of `obj` in a `Storage` only if it is still `expected`,
+        holding the lock for `obj`. Returns whether the value was set.
+        """
+        index = self.stripe(obj)
+        lock = self.locks[index]
+        contended = not lock.acquire(blocking=False)
+        if contended:
+            lock.acquire()
+        try:
+            self.acquired[index] += 1
+            if contended:
+                self.contended[index] += 1
+            committed = storage.compare_and_set(obj, expected, value)
+            if not committed:
+                self.conflicts[index] += 1
+            return committed
+        finally:
+            lock.release()
+
+    def stats(self):
+        """Get the total number of commits attempted, commits that waited on a lock, and conflicts"""
+        return {
+            'stripes': len(self.locks),
+            'acquired': sum(self.acquired),
+            'contended': sum(self.contended),
+            'conflicts': sum(self.conflicts),
+        }
+
+    def reset(self):
+        for counters in (self.acquired, self.contended, self.conflicts):
+            counters[:] = [0] * len(counters)
@@ -0,0 +1,114 @@
+from bisect import bisect_left
+from threading import Lock
+
+# Upper bounds in seconds, from 1µs to 1s
+DEFAULT_BUCKETS = (
+    0.000001, 0.0000025, 0.000005, 0.00001, 0.000025, 0.00005, 0.0001, 0.00025,
+    0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0,
+)
+OTHER_REASONS = '<other>'
+
+class Histogram:
+    """Counts of observed durations by bucket upper bound, with their sum"""
+    __slots__ = ('bounds', 'counts', 'sum', 'count')
+
+    def __init__(self, bounds):
+        self.bounds = bounds
+        self.counts = [0] * (len(bounds) + 1)
+        self.sum = 0.0
+        self.count = 0
+
+    def observe(self, value):
+        self.counts[bisect_left(self.bounds, value)] += 1
+        self.sum += value
+        self.count += 1
+
+    def export(self):
+        """Get the histogram with cumulative bucket counts, like Prometheus"""
+        buckets = []
+        total = 0
+        for bound, count in zip((*self.bounds, '+Inf'), self.counts):
+            total += count
+            buckets.append([bound, total])
+        return { 'count': self.count, 'sum': self.sum, 'buckets': buckets }
+
+class EdgeMetrics:
+    """Counters and latency histograms for one transition"""
+    __slots__ = ('calls', 'moved', 'blocked', 'conflicts', 'reasons', 'lookup', 'condition', 'effect')
+
+    def __init__(self, bounds):
+        self.calls = 0
+        self.moved = 0
+        self.blocked = 0
+        self.conflicts = 0
+        self.reasons = {}
+        self.lookup = Histogram(bounds)
+        self.condition = Histogram(bounds)
+        self.effect = Histogram(bounds)
+
+class ChartMetrics:
+    """
+    Opt-in instrumentation for `Chart.to` and `Chart.ato`, set as `Chart.metrics`.
+    Records calls, outcomes, blocked reasons and the time spent finding the
+    transition, evaluating its Conditions and running its Effects, per transition.
+    At most `max_reasons` distinct blocked reasons are kept per transition.
+    """
+    def __init__(self, buckets=DEFAULT_BUCKETS, max_reasons=100):
+        self.buckets = tuple(buckets)
+        self.max_reasons = max_reasons
+        self.edges = {}
+        self.lock = Lock()
+
+    def edge(self, source, target):
+        key = (source, target)
+        edge = self.edges.get(key)
+        if edge is None:
+            edge = self.edges.setdefault(key, EdgeMetrics(self.buckets))
+        return edge
+
+    def record(self, plan, lookup, condition, effect=None, reason=None, conflict=False, prefix=''):
+        """
+        Record one call of a transition, with `effect` None unless it was made,
+        and `prefix` like `PAYMENT.` for a transition inside a sub-chart
+        """
+        edge = self.edge(prefix + plan.source.value, prefix + plan.target.value)
+        with self.lock:
+            edge.calls += 1
+            edge.lookup.observe(lookup)
+            edge.condition.observe(condition)
+            if conflict:
+                edge.conflicts += 1
+            elif reason is not None:
+                edge.blocked += 1
+                # Conditions may block with any value, but reasons are exported by name
+                reason = str(reason)
+                reasons = edge.reasons
+                if reason not in reasons and len(reasons) >= self.max_reasons:
+                    reason = OTHER_REASONS
+                reasons[reason] = reasons.get(reason, 0) + 1
+            else:
+                edge.moved += 1
+                edge.effect.observe(effect)
+
+    def export(self):
+        """Get every recorded transition's metrics as plain dicts and lists"""
+        with self.lock:
+            return [
+                {
+                    'from': source,
+                    'to': target,
+                    'calls': edge.calls,
+                    'moved': edge.moved,
+                    'blocked': edge.blocked,
+                    'conflicts': edge.conflicts,
+                    'reasons': dict(edge.reasons),
+                    'lookup': edge.lookup.export(),
+                    'condition': edge.condition.export(),
+                    'effect': edge.effect.export(),
+                }
+                for (source, target), edge in self.edges.items()
+            ]
+
+    def reset(self):
+        with self.lock:
+            self.edges.clear()
@@ -0,0 +1,307 @@
+from inspect import isclass
+from .condition import Condition, ConditionalExpression
+from .context import EvaluationContext
+from .effect import Effect, EffectExpression
+from .state import EMPTY_CONDITION, EMPTY_EFFECT
+from .exceptions import ChartSyntaxError, TransitionError, TransitionMissingArgs
+
+class TransitionResult:
+    """
+    Whether a transition is allowed, and if not, the reason it is blocked
+    and any arguments that were missing to evaluate it
+    """
+    __slots__ = ('source', 'target', 'allowed', 'reason', 'missing')
+
+    def __init__(self, source, target, allowed, reason=None, missing=()):
+        self.source = source
+        self.target = target
+        self.allowed = allowed
+        self.reason = reason
+        self.missing = missing
+
+    def __bool__(self):
+        return self.allowed
+
+    def __repr__(self):
+        reason = f' ({self.reason})' if self.reason is not None else ''
+        allowed = 'allowed' if self.allowed else 'blocked'
+        return f'<{self.__class__.__name__} {self.source} -> {self.target} {allowed}{reason}>'
+
+class TransitionPlan:
+    """
+    Everything needed to run one `(from_state, to_state)` transition, resolved
+    once when the Chart class is created so that `Chart.to()`, `Chart.can()`
+    and `Chart.choices()` never have to walk the chart or introspect signatures.
+    """
+    __slots__ = ('source', 'target', 'transition', 'condition', 'effects', 'params', 'required_params', 'pure', 'is_async', 'operands', 'memoize')
+
+    def __init__(self, source, transition, compiled=None):
+        """
+        Compile a transition from a State class. Pass the same `compiled` dict when
+        compiling many plans that share transitions to compile each of them once for
+        every source State without exit hooks.
+        """
+        if compiled is None or source.to_exit or source.on_exit:
+            fields = self.compile(source, transition)
+        else:
+            fields = compiled.get(id(transition))
+            if fields is None:
+                fields = compiled[id(transition)] = self.compile(source, transition)
+        # Set the slots through their descriptors, since `__setattr__` is frozen
+        set_source(self, source)
+        set_target(self, transition.__class__)
+        set_transition(self, transition)
+        for set_slot, value in zip(COMPILED_SETTERS, fields):
+            set_slot(self, value)
+
+    @classmethod
+    def deferred(cls, source, transitions):
+        """
+        Plan the transitions from a State class, by to_value, to be compiled when their
+        Conditions, Effects or parameters are first used, so a Chart class with many
+        transitions is quick to create. Check the hooks of their States with
+        `check_hooks` to still raise for those at once.
+        """
+        new = DeferredPlan.__new__
+        plans = {}
+        for to_value, transition in transitions.items():
+            plan = plans[to_value] = new(DeferredPlan)
+            set_source(plan, source)
+            set_target(plan, transition.__class__)
+            set_transition(plan, transition)
+        return plans
+
+    @classmethod
+    def check_hooks(cls, state):
+        """Raise if any enter or exit hook of a State class is not a Condition or Effect"""
+        cls.hook(state, 'to_exit', Condition, ConditionalExpression)
+        cls.hook(state, 'to_enter', Condition, ConditionalExpression)
+        cls.hook(state, 'on_exit', Effect, EffectExpression)
+        cls.hook(state, 'on_enter', Effect, EffectExpression)
+
+    @classmethod
+    def compile(cls, source, transition):
+        """Get the values of `COMPILED_SLOTS` for a transition from a State class"""
+        target = transition.__class__
+        condition = transition.condition
+        effect = transition.effect
+        if condition is EMPTY_CONDITION and effect is EMPTY_EFFECT \
+                and not (source.to_exit or source.on_exit or target.to_enter or target.on_enter):
+            return TRIVIAL_FIELDS
+        condition = condition if condition else None
+        effect = effect if effect else None
+
+        # Fold the State hooks into the transition: exit guard & condition & enter guard,
+        # then on_exit + effect + on_enter
+        condition = cls.fold_conditions((
+            cls.hook(source, 'to_exit', Condition, ConditionalExpression),
+            condition,
+            cls.hook(target, 'to_enter', Condition, ConditionalExpression),
+        ))
+        effects = cls.fold_effects((
+            cls.hook(source, 'on_exit', Effect, EffectExpression),
+            effect,
+            cls.hook(target, 'on_enter', Effect, EffectExpression),
+        ))
+        params = frozenset()
+        required_params = frozenset()
+        for expression in (condition, *effects):
+            if expression is not None:
+                params |= expression.params
+                required_params |= expression.required_params
+        leaves = cls.leaves(condition)
+        operands = tuple({ operand.__class__: operand for operand in reversed(leaves) }.values())[::-1]
+        return (
+            condition,
+            effects,
+            operands,
+            # Only pay for an EvaluationContext when a Condition repeats or can be cached
+            len(operands) < len(leaves) or any(operand.pure_cache is not None for operand in operands),
+            params,
+            required_params,
+            condition is None or condition.pure,
+            any(expression.is_async for expression in (condition, *effects) if expression is not None),
+        )
+
+    @staticmethod
+    def hook(state, name, kind, expression_kind):
+        """Get a State's hook if it is set, checking it is a `kind` or an expression of them"""
+        value = getattr(state, name)
+        if value and not isinstance(value, expression_kind) \
+                and not (isclass(value) and issubclass(value, kind)):
+            article = 'an' if kind.__name__[0] in 'AEIOU' else 'a'
+            raise ChartSyntaxError(f'{state}: {name} must be {article} {kind.__name__} or {kind.__name__} expression')
+        return value
+
+    @staticmethod
+    def fold_conditions(conditions):
+        """Combine the Conditions that are set with `&`, in order, or get None if none are"""
+        conditions = [condition for condition in conditions if condition]
+        if not conditions:
+            return None
+        folded = conditions[0] if isinstance(conditions[0], ConditionalExpression) \
+            else ConditionalExpression(conditions[0])
+        for condition in conditions[1:]:
+            folded = folded & condition
+        return folded
+
+    @staticmethod
+    def fold_effects(effects):
+        """Flatten the Effects that are set into one tuple, in order"""
+        effects = [effect for effect in effects if effect]
+        return tuple(
+            operand
+            for effect in effects
+            for operand in TransitionPlan.flatten(
+                effect if isinstance(effect, EffectExpression) else EffectExpression(effect)
+            )
+        )
+
+    def __setattr__(self, name, value):
+        raise AttributeError(f'{self.__class__.__name__} is frozen')
+
+    def __repr__(self):
+        return f'<{self.__class__.__name__} {self.source} -> {self.transition}>'
+
+    @staticmethod
+    def flatten(effect):
+        """Unroll an Effect expression into its Effects, in execution order"""
+        if effect is None:
+            return ()
+        if isinstance(effect, EffectExpression):
+            return tuple(
+                operand
+                for value in effect.values
+                for operand in TransitionPlan.flatten(value)
+            )
+        return (effect,)
+
+    @staticmethod
+    def leaves(condition):
+        """Get every Condition in a Condition expression, in declared order"""
+        if condition is None:
+            return ()
+        if isinstance(condition, ConditionalExpression):
+            return tuple(
+                operand
+                for value in condition.values
+                for operand in TransitionPlan.leaves(value)
+            )
+        return (condition,)
+
+    def check(self, kwargs):
+        """Raise if any argument required by the Conditions or Effects is missing"""
+        for param in self.required_params:
+            if param not in kwargs:
+                raise TransitionMissingArgs(param)
+
+    def missing(self, kwargs):
+        """Get the arguments required by the Conditions or Effects that are missing"""
+        return tuple(sorted(param for param in self.required_params if param not in kwargs))
+
+    def eval(self, kwargs, short_circuit=False, context=None):
+        """
+        Evaluate the Condition, returning True or the reason the transition is blocked.
+        Pass an `EvaluationContext` to share Condition results with other evaluations.
+        """
+        condition = self.condition
+        if condition is None:
+            return True
+        if condition.is_async and context is None:
+            raise TransitionError(f'{self.source} to {self.target} has async Conditions, use the async Chart methods')
+        if context is None and self.memoize:
+            context = EvaluationContext(kwargs)
+        return condition.evaluate(kwargs, short_circuit, context)
+
+    def evaluate(self, kwargs, short_circuit=False, context=None):
+        """Check and evaluate the transition without raising, returning a `TransitionResult`"""
+        missing = self.missing(kwargs)
+        if missing:
+            return self.missing_result(missing)
+        return self.result(self.eval(kwargs, short_circuit, context))
+
+    async def aeval(self, kwargs, short_circuit=False, context=None):
+        """Evaluate the Condition like `eval`, awaiting any async Conditions"""
+        condition = self.condition
+        if condition is None:
+            return True
+        if context is None and self.memoize:
+            context = EvaluationContext(kwargs)
+        return await condition.aevaluate(kwargs, short_circuit, context)
+
+    async def aevaluate(self, kwargs, short_circuit=False, context=None):
+        """Check and evaluate the transition like `evaluate`, awaiting any async Conditions"""
+        missing = self.missing(kwargs)
+        if missing:
+            return self.missing_result(missing)
+        return self.result(await self.aeval(kwargs, short_circuit, context))
+
+    def missing_result(self, missing):
+        return TransitionResult(self.source, self.target, False, f'Missing arguments {", ".join(missing)}', missing)
+
+    def result(self, condition_result):
+        if condition_result != True: # Strings used in error message
+            return TransitionResult(self.source, self.target, False, condition_result)
+        return TransitionResult(self.source, self.target, True)
+
+    def exec(self, kwargs):
+        """Execute the Effects in order"""
+        if self.is_async and any(effect.is_async for effect in self.effects):
+            raise TransitionError(f'{self.source} to {self.target} has async Effects, use the async Chart methods')
+        for effect in self.effects:
+            effect.exec(**effect.bind(kwargs))
+
+    def exec_batch(self, objects, kwargs):
+        """Execute the Effects in order, once for all the stateful objects that took the transition"""
+        if self.is_async and any(effect.is_async for effect in self.effects):
+            raise TransitionError(f'{self.source} to {self.target} has async Effects, use the async Chart methods')
+        for effect in self.effects:
+            effect.exec_batch(objects, **effect.bind(kwargs))
+
+    async def aexec(self, kwargs):
+        """Execute the Effects in order, awaiting each async Effect before the next"""
+        for effect in self.effects:
+            result = effect.exec(**effect.bind(kwargs))
+            if effect.is_async:
+                await result
+
+class DeferredPlan(TransitionPlan):
+    """
+    A `TransitionPlan` made by `TransitionPlan.deferred` that compiles itself on first use,
+    then becomes a plain `TransitionPlan` so its attributes are found without `__getattr__`
+    """
+    __slots__ = ()
+
+    def __getattr__(self, name):
+        # Only called for slots that are still empty
+        if name not in COMPILED_SLOTS:
+            raise AttributeError(f'{TransitionPlan.__name__} has no attribute {name}')
+        fields = self.compile(self.source, self.transition)
+        for set_slot, value in zip(COMPILED_SETTERS, fields):
+            set_slot(self, value)
+        object.__setattr__(self, '__class__', TransitionPlan)
+        return fields[COMPILED_SLOTS.index(name)]
+
+    def __repr__(self):
+        return f'<{TransitionPlan.__name__} {self.source} -> {self.transition}>'
+
+# The slots `TransitionPlan.compile` fills, and their values for a transition without Conditions, Effects or State hooks
+COMPILED_SLOTS = ('condition', 'effects', 'operands', 'memoize', 'params', 'required_params', 'pure', 'is_async')
+TRIVIAL_FIELDS = (None, (), (), False, frozenset(), frozenset(), True, False)
+
+set_source = TransitionPlan.source.__set__
+set_target = TransitionPlan.target.__set__
+set_transition = TransitionPlan.transition.__set__
+COMPILED_SETTERS = tuple(getattr(TransitionPlan, name).__set__ for name in COMPILED_SLOTS)
+
+def shared_operands(plans, kwargs):
+    """
+    Get one of each distinct Condition used by the plans that have all their arguments,
+    by class, so each can be evaluated once for all of them
+    """
+    operands = {}
+    for plan in plans:
+        if not plan.missing(kwargs):
+            for operand in plan.operands:
+                operands.setdefault(operand.__class__, operand)
+    return operands
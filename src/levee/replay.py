@@ -0,0 +1,166 @@
+import os
+import json
+from .chart import subchart_class
+from .exceptions import LeveeException, TransitionConflict, TransitionDoesNotExist, TransitionError
+
+FORMAT = 1
+CHUNK_SIZE = 1 << 16
+MAX_ERRORS = 100
+
+def transition_exists(chart_class, source, target):
+    """
+    Whether a Chart has a transition between two stored values, where either may be
+    a composite value like `PAYMENT.AUTHORIZED` and the transition inside its sub-chart
+    """
+    if type(target) is not str:
+        return False
+    try:
+        current = chart_class.source_state(source)
+        prefix, _, rest = target.partition('.')
+        if rest and prefix == current.value and current.subchart is not None:
+            return transition_exists(subchart_class(current), chart_class.inner_value(source), rest)
+        state_class = chart_class.source_state(target)
+    except TransitionError:
+        return False
+    return chart_class.stored_value(state_class) == target and state_class.value in chart_class.plans.get(current, ())
+
+def parse(line):
+    """Parse one journal line, or get None if it isn't valid JSON"""
+    try:
+        return json.loads(line)
+    except ValueError:
+        return None
+
+class Replay:
+    """
+    Rebuilds the state of every object in a journal written by `JournalWriter`
+    without evaluating Conditions or running Effects, only checking that each
+    transition made exists in the Chart, or inside a sub-chart for composite values
+    like `PAYMENT.AUTHORIZED`, and starts from the last replayed stored value.
+    Refused transitions and entries without a key are skipped. Transitions that
+    fail those checks and malformed lines, like one torn by a crash, are skipped
+    too, counted in `skipped` with the first `MAX_ERRORS` reasons kept in `errors`. `offset` is how far into the journal
+    file has been replayed, in bytes.
+    """
+    def __init__(self, chart_class, states=None, offset=0, count=0, skipped=0):
+        self.chart_class = chart_class
+        self.edges = {
+            from_state.value: frozenset(plans)
+            for from_state, plans in chart_class.plans.items()
+        }
+        self.states = dict(states or {})
+        self.offset = offset
+        self.count = count
+        self.skipped = skipped
+        self.errors = []
+
+    def apply(self, key, source, target):
+        """Apply one transition made by an object"""
+        known = self.states.get(key)
+        if known is not None and known != source:
+            raise TransitionConflict(f'{key}: Journal has a transition from {source} but it was in {known}')
+        if target not in self.edges.get(source, ()) and not transition_exists(self.chart_class, source, target):
+            raise TransitionDoesNotExist(f'{key}: {source} to {target}')
+        self.states[key] = target
+        self.count += 1
+
+    def skip(self, error):
+        """Record a journal entry that couldn't be replayed"""
+        self.skipped += 1
+        if len(self.errors) < MAX_ERRORS:
+            self.errors.append(error)
+
+    def read(self, file, snapshot_path=None, snapshot_every=None):
+        """
+        Apply every entry in a journal opened in binary mode, starting at `offset`,
+        and writing a snapshot every `snapshot_every` entries. An incomplete last
+        line is left for the next read, and lines that aren't entries are skipped.
+        Memory use depends on the number of objects, not the length of the journal.
+        """
+        file.seek(self.offset)
+        loads = json.loads
+        edges = self.edges
+        states = self.states
+        get = states.get
+        offset = self.offset
+        count = self.count
+        try:
+            while True:
+                lines = file.readlines(CHUNK_SIZE)
+                if not lines:
+                    break
+                complete = lines[-1][-1:] == b'\n'
+                if not complete:
+                    lines.pop()
+                # One parse per chunk is much faster than one per line
+                try:
+                    entries = loads(b'[' + b','.join(lines) + b']')
+                except ValueError:
+                    entries = None
+                if entries is None or len(entries) != len(lines):
+                    # A malformed line spoils the whole chunk, so parse each line alone
+                    entries = [parse(line) for line in lines]
+                for line, entry in zip(lines, entries):
+                    start = offset
+                    offset += len(line)
+                    try:
+                        key, source, target, _, _, _, reason = entry
+                        if reason is not None or key is None:
+                            continue
+                        valid = get(key, source) == source and target in edges.get(source, ())
+                    except (TypeError, ValueError):
+                        self.skip(LeveeException(f'Malformed journal entry at byte {start}: {line[:80]!r}'))
+                        continue
+                    if not valid:
+                        try:
+                            self.apply(key, source, target)
+                        except TransitionError as error:
+                            self.skip(error)
+                        continue
+                    states[key] = target
+                    count += 1
+                    if snapshot_every and count % snapshot_every == 0:
+                        self.offset, self.count = offset, count
+                        self.save(snapshot_path)
+                if not complete:
+                    break
+        finally:
+            self.offset, self.count = offset, count
+        return self
+
+    def save(self, path):
+        """Write a snapshot of the replayed states and offset, replacing the file atomically"""
+        temp_path = f'{path}.{os.getpid()}.tmp'
+        with open(temp_path, 'w') as file:
+            json.dump({
+                'format': FORMAT,
+                'chart': self.chart_class.__name__,
+                'offset': self.offset,
+                'count': self.count,
+                'skipped': self.skipped,
+                'states': list(self.states.items()),
+            }, file, separators=(',', ':'))
+        os.replace(temp_path, path)
+
+    @classmethod
+    def load(cls, chart_class, path):
+        """Continue from a snapshot written by `save`, or start from the beginning if there isn't one"""
+        try:
+            with open(path) as file:
+                data = json.load(file)
+        except FileNotFoundError:
+            return cls(chart_class)
+        except (OSError, ValueError) as error:
+            raise LeveeException(f'Unreadable snapshot "{path}": {error}')
+        if data.get('format') != FORMAT or data.get('chart') != chart_class.__name__:
+            raise LeveeException(f'Snapshot "{path}" is not for {chart_class.__name__}')
+        return cls(chart_class, ((key, value) for key, value in data['states']), data['offset'], data['count'], data.get('skipped', 0))
+
+def replay_journal(chart_class, journal_path, snapshot_path=None, snapshot_every=None):
+    """Replay a journal file, from the latest snapshot if there is one"""
+    replay = Replay.load(chart_class, snapshot_path) if snapshot_path is not None else Replay(chart_class)
+    with open(journal_path, 'rb') as file:
+        replay.read(file, snapshot_path, snapshot_every if snapshot_path is not None else None)
+    if snapshot_path is not None:
+        replay.save(snapshot_path)
+    return replay
@@ -3,6 +3,10 @@ from .exceptions import ChartSyntaxError
 from .condition import ConditionalExpression
 from .effect import EffectExpression
 
+# Expressions are never mutated, so conditionless States can share empty ones
+EMPTY_CONDITION = ConditionalExpression()
+EMPTY_EFFECT = EffectExpression()
+
 class StateMeta(type):
 
     def __init__(self, name, extends, attrs, **kwargs):
@@ -16,10 +20,10 @@ class StateMeta(type):
 
     def __str__(self):
         return self.__name__
-    
-    def __hash__(self):
-        return self.value.__hash__()
-    
+
+    # State classes are only equal to themselves, so they keep the identity hash of
+    # `type`, which is much faster to look up in the dicts keyed by them
+
     @property
     def state(self):
         return self
@@ -37,18 +41,27 @@ class State(metaclass=StateMeta):
     Extend this class and optionally define `Conditions` or `Effects` that
     will always be used for transitions involving this state via `to_enter`,
     `to_exit`, `on_enter`, and `on_exit`.
+
+    They are folded into every transition when the Chart class is created, so
+    a transition requires `to_exit & condition & to_enter` and then runs
+    `on_exit + effect + on_enter`.
+
+    Set `subchart` to a Chart class, or its import path to load it on first use,
+    to give this State its own States. Objects in it store composite values like
+    `PAYMENT.AUTHORIZED`, starting from the sub-chart's initial State.
     """
     to_enter = None
     to_exit = None
     on_enter = None
     on_exit = None
+    subchart = None
 
     def __init__(self, condition=None, **kwargs):
         if condition is None and not kwargs.get('conditionless', False):
             raise ChartSyntaxError('Empty Condition `()` not allowed')
-        self.condition = ConditionalExpression() if condition is None \
+        self.condition = EMPTY_CONDITION if condition is None \
             else ConditionalExpression(condition)
-        self.effect = EffectExpression()
+        self.effect = EMPTY_EFFECT
 
     def __call__(self, *args, **kwargs):
         raise ChartSyntaxError('Conditions `()` cannot come after Effects `[]`')
@@ -0,0 +1,169 @@
+from contextlib import contextmanager, nullcontext
+from .exceptions import LeveeException
+
+class Storage:
+    """
+    Reads and writes the state value of stateful objects for a Chart.
+    Set `atomic = True` when `compare_and_set` is safe without `Chart.locks`.
+    """
+    atomic = False
+
+    def key(self, obj):
+        """
+        Identify a stateful object in journals, or get None if it has no identity
+        that outlives it. Journal entries without a key can't be replayed.
+        """
+        return None
+
+    def get(self, obj):
+        raise NotImplementedError
+
+    def set(self, obj, value):
+        raise NotImplementedError
+
+    def compare_and_set(self, obj, expected, value):
+        """Set the state value only if it is still `expected`, returning whether it was set"""
+        if self.get(obj) != expected:
+            return False
+        self.set(obj, value)
+        return True
+
+    def transaction(self):
+        """Get a context manager that groups the writes inside it, if the storage supports it"""
+        return nullcontext(self)
+
+class DictStorage(Storage):
+    """Stores the state value under a key of a dict, identified in journals by `id_key` if given"""
+
+    def __init__(self, item_key='state', id_key=None):
+        self.item_key = item_key
+        self.id_key = id_key
+
+    def key(self, obj):
+        return obj[self.id_key] if self.id_key is not None else None
+
+    def get(self, obj):
+        return obj[self.item_key]
+
+    def set(self, obj, value):
+        obj[self.item_key] = value
+
+class AttributeStorage(Storage):
+    """Stores the state value in an attribute of an object, identified in journals by `id_attribute` if given"""
+
+    def __init__(self, attribute='state', id_attribute=None):
+        self.attribute = attribute
+        self.id_attribute = id_attribute
+
+    def key(self, obj):
+        return getattr(obj, self.id_attribute) if self.id_attribute is not None else None
+
+    def get(self, obj):
+        return getattr(obj, self.attribute)
+
+    def set(self, obj, value):
+        setattr(obj, self.attribute, value)
+
+# Default storages hold no per-object state, so one of each is shared by every Chart
+DEFAULT_STORAGES = {}
+
+def default_storage(obj, state_attribute='state'):
+    """Get the storage `Chart` uses for a dict or object when none is given"""
+    is_dict = type(obj) is dict
+    storage = DEFAULT_STORAGES.get((is_dict, state_attribute))
+    if storage is None:
+        storage = DictStorage(state_attribute) if is_dict else AttributeStorage(state_attribute)
+        storage = DEFAULT_STORAGES.setdefault((is_dict, state_attribute), storage)
+    return storage
+
+class SubchartStorage(Storage):
+    """
+    Stores the state value of a sub-chart inside the composite value of its
+    parent's State, like `PAYMENT.AUTHORIZED`, through the parent's storage
+    """
+    def __init__(self, storage, prefix):
+        self.storage = storage
+        self.prefix = f'{prefix}.'
+        self.atomic = storage.atomic
+
+    def key(self, obj):
+        return self.storage.key(obj)
+
+    def get(self, obj):
+        value = self.storage.get(obj)
+        if type(value) is str and value.startswith(self.prefix):
+            return value[len(self.prefix):]
+        if value == self.prefix[:-1]:
+            return None
+        raise LeveeException(f'{obj}: State "{value}" is not inside {self.prefix[:-1]}')
+
+    def set(self, obj, value):
+        self.storage.set(obj, self.prefix + value)
+
+    def compare_and_set(self, obj, expected, value):
+        expected = self.prefix[:-1] if expected is None else self.prefix + expected
+        return self.storage.compare_and_set(obj, expected, self.prefix + value)
+
+    def transaction(self):
+        return self.storage.transaction()
+
+class SQLiteStorage(Storage):
+    """
+    Stores the state value in a column of a SQLite table, where the stateful
+    object is the row's key. Each compare and set is a single conditional
+    `UPDATE`, so transitions from other connections or processes can't be lost.
+    Writes are committed immediately unless inside `transaction()`.
+    """
+    atomic = True
+
+    def __init__(self, connection, table, key_column='id', state_column='state'):
+        for name in (table, key_column, state_column):
+            if not name.isidentifier():
+                raise LeveeException(f'Invalid SQLite identifier "{name}"')
+        self.connection = connection
+        self.depth = 0
+        self.select_sql = f'SELECT "{state_column}" FROM "{table}" WHERE "{key_column}" = ?'
+        self.update_sql = f'UPDATE "{table}" SET "{state_column}" = ? WHERE "{key_column}" = ?'
+        self.compare_sql = f'{self.update_sql} AND "{state_column}" IS ?'
+
+    def key(self, obj):
+        return obj
+
+    def get(self, obj):
+        row = self.connection.execute(self.select_sql, (obj,)).fetchone()
+        if row is None:
+            raise LeveeException(f'No row with key "{obj}"')
+        return row[0]
+
+    def set(self, obj, value):
+        cursor = self.connection.execute(self.update_sql, (value, obj))
+        self.written()
+        if cursor.rowcount == 0:
+            raise LeveeException(f'No row with key "{obj}"')
+
+    def compare_and_set(self, obj, expected, value):
+        cursor = self.connection.execute(self.compare_sql, (value, obj, expected))
+        self.written()
+        return cursor.rowcount == 1
+
+    def written(self):
+        if self.depth == 0:
+            self.connection.commit()
+
+    @contextmanager
+    def transaction(self):
+        """
+        Commit every write inside the block together, or roll them all back
+        if it raises. Nested blocks join the outermost one.
+        """
+        self.depth += 1
+        try:
+            yield self
+        except BaseException:
+            self.depth -= 1
+            if self.depth == 0:
+                self.connection.rollback()
+            raise
+        self.depth -= 1
+        if self.depth == 0:
+            self.connection.commit()
@@ -0,0 +1,152 @@
+from util.import_relative import enable_imports
+enable_imports(__file__, '../../src')
+
+from levee import Chart
+from levee.metrics import ChartMetrics
+from runner import benchmark
+from charts import (
+    wide_chart_attrs, deep_chart_attrs, generated_chart_attrs, generated_spec, make_chart,
+    condition_tree, effect_chain, expression_chart,
+)
+
+@benchmark('construct/wide_500')
+def construct_wide():
+    attrs = wide_chart_attrs(500)
+    return lambda: make_chart(attrs)
+
+@benchmark('construct/deep_200')
+def construct_deep():
+    attrs = deep_chart_attrs(200)
+    return lambda: make_chart(attrs)
+
+@benchmark('construct/generated_1k_10k')
+def construct_generated():
+    attrs = generated_chart_attrs(1000, 10000)
+    return lambda: make_chart(attrs)
+
+@benchmark('construct/generated_10k_100k')
+def construct_generated_large():
+    """10x `construct/generated_1k_10k`, so about a tenth of its ops/sec when compilation is linear"""
+    attrs = generated_chart_attrs(10000, 100000)
+    return lambda: make_chart(attrs)
+
+@benchmark('construct/spec_wide_500')
+def construct_spec():
+    spec = { 'transitions': { 'ROOT': { f'S{i}': None for i in range(500) } } }
+    spec['transitions'].update({ f'S{i}': { 'ROOT': None } for i in range(500) })
+    return lambda: Chart.from_spec('SpecChart', spec)
+
+@benchmark('construct/type_wide_500')
+def construct_type():
+    """The DSL equivalent of `construct/spec_wide_500`, creating the State classes too"""
+    return lambda: make_chart(wide_chart_attrs(500))
+
+@benchmark('construct/spec_generated_1k_10k')
+def construct_spec_generated():
+    spec = { 'transitions': generated_spec(1000, 10000) }
+    return lambda: Chart.from_spec('SpecChart', spec)
+
+@benchmark('construct/type_generated_1k_10k')
+def construct_type_generated():
+    return lambda: make_chart(generated_chart_attrs(1000, 10000))
+
+@benchmark('construct/cold_start_1k_10k')
+def construct_cold_start():
+    """What a short-lived worker pays: create the Chart class, then make one transition"""
+    attrs = generated_chart_attrs(1000, 10000)
+    def operation():
+        GeneratedChart = make_chart(attrs)
+        GeneratedChart({ 'state': None }).to('S1')
+    return operation
+
+@benchmark('to/plain')
+def to_plain():
+    TestChart = expression_chart()
+    chart = TestChart({ 'state': None })
+    states = TestChart.states
+    def operation():
+        chart.to(states[1])
+        chart.to(states[0])
+    return operation
+
+@benchmark('to/plain_metrics')
+def to_plain_metrics():
+    TestChart = expression_chart()
+    TestChart.metrics = ChartMetrics()
+    chart = TestChart({ 'state': None })
+    states = TestChart.states
+    def operation():
+        chart.to(states[1])
+        chart.to(states[0])
+    return operation
+
+@benchmark('next_state/condition_tree_6')
+def next_state_condition_tree():
+    TestChart = expression_chart(condition_tree(6))
+    alpha, beta = TestChart.state_values
+    return lambda: TestChart.next_state(alpha, beta, yes=True, no=False)
+
+@benchmark('to/condition_tree_6')
+def to_condition_tree():
+    TestChart = expression_chart(condition_tree(6))
+    chart = TestChart({ 'state': None })
+    states = TestChart.states
+    def operation():
+        chart.to(states[1], yes=True, no=False)
+        chart.to(states[0])
+    return operation
+
+@benchmark('to/effect_chain_50')
+def to_effect_chain():
+    TestChart = expression_chart(effect=effect_chain(50))
+    chart = TestChart({ 'state': None })
+    states = TestChart.states
+    def operation():
+        chart.to(states[1], whatever=None)
+        chart.to(states[0])
+    return operation
+
+@benchmark('can/condition_tree_6')
+def can_condition_tree():
+    TestChart = expression_chart(condition_tree(6))
+    chart = TestChart({ 'state': None })
+    target = TestChart.states[1]
+    return lambda: chart.can(target, yes=True, no=False)
+
+@benchmark('choices/wide_100')
+def choices_wide():
+    TestChart = make_chart(wide_chart_attrs(100))
+    chart = TestChart({ 'state': None })
+    return lambda: chart.choices()
+
+class LegacyBinding:
+    """How Chart objects were bound before they were slotted: two closures and a `__dict__`"""
+
+    def __init__(self, chart_class, stateful_object, state_attribute='state'):
+        def obj_getter():
+            return getattr(stateful_object, state_attribute)
+        def obj_setter(value):
+            setattr(stateful_object, state_attribute, value)
+
+        def dict_getter():
+            return stateful_object[state_attribute]
+        def dict_setter(value):
+            stateful_object[state_attribute] = value
+
+        self.getter = dict_getter if type(stateful_object) is dict else obj_getter
+        self.setter = dict_setter if type(stateful_object) is dict else obj_setter
+        if self.getter() is None:
+            self.setter(list(chart_class.transitions.keys())[0].value)
+        self.obj = stateful_object
+
+@benchmark('bind/dict_1k')
+def bind_dict():
+    TestChart = expression_chart(slotted=True)
+    rows = [{ 'state': 'X0' } for _ in range(1000)]
+    return lambda: [TestChart(row) for row in rows]
+
+@benchmark('bind/dict_1k_legacy')
+def bind_dict_legacy():
+    TestChart = expression_chart()
+    rows = [{ 'state': 'X0' } for _ in range(1000)]
+    return lambda: [LegacyBinding(TestChart, row) for row in rows]
@@ -0,0 +1,64 @@
+from util.import_relative import enable_imports
+enable_imports(__file__, '../../src')
+
+from levee.condition import ConditionalExpression
+from levee.effect import EffectExpression
+from runner import benchmark
+from charts import condition_tree, effect_chain
+
+def legacy_evaluate(expression, kwargs):
+    """
+    How expressions were evaluated before kwargs were passed through once:
+    a closure per level, and a filtered copy of kwargs for every operand
+    """
+    if len(expression.values) == 0:
+        return
+    def eval_operand(operand):
+        operand_kwargs = {
+            k: kwargs[k]
+            for k in operand.params
+            if k in kwargs
+        }
+        if isinstance(operand, ConditionalExpression):
+            return legacy_evaluate(operand, operand_kwargs)
+        return operand.eval(**operand_kwargs)
+    if expression.operator is None:
+        return eval_operand(expression.values[0])
+    if expression.operator is expression.Operators.NOT:
+        return eval_operand(expression.values[0]) != True
+    first, second = expression.values
+    return expression.combine(eval_operand(first), eval_operand(second))
+
+def legacy_execute(expression, kwargs):
+    exec_operand = lambda operand: operand.exec(**{
+        k: v
+        for k, v in kwargs.items()
+        if k in operand.params
+    })
+    for value in expression.values:
+        if isinstance(value, EffectExpression):
+            legacy_execute(value, kwargs)
+        else:
+            exec_operand(value)
+
+KWARGS = { 'yes': True, 'no': False, 'whatever': None, 'unused': 1 }
+
+@benchmark('eval/condition_tree_8')
+def eval_condition_tree():
+    condition = ConditionalExpression(condition_tree(8))
+    return lambda: condition.evaluate(KWARGS)
+
+@benchmark('eval/condition_tree_8_legacy')
+def eval_condition_tree_legacy():
+    condition = ConditionalExpression(condition_tree(8))
+    return lambda: legacy_evaluate(condition, KWARGS)
+
+@benchmark('exec/effect_chain_50')
+def exec_effect_chain():
+    effect = EffectExpression(effect_chain(50))
+    return lambda: effect.execute(KWARGS)
+
+@benchmark('exec/effect_chain_50_legacy')
+def exec_effect_chain_legacy():
+    effect = EffectExpression(effect_chain(50))
+    return lambda: legacy_execute(effect, KWARGS)
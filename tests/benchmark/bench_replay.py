@@ -0,0 +1,36 @@
+from util.import_relative import enable_imports
+enable_imports(__file__, '../../src')
+
+import io
+import json
+from levee.replay import Replay
+from runner import benchmark
+from charts import deep_chart_attrs, make_chart
+
+def cycle_journal(chart_class, objects, events):
+    """A journal of `events` transitions made by `objects` objects, each going around the cycle"""
+    values = chart_class.state_values
+    positions = [0] * objects
+    lines = []
+    for event in range(events):
+        key = event % objects
+        position = positions[key]
+        target = (position + 1) % len(values)
+        lines.append(json.dumps([key, values[position], values[target], None, 0.0, 0.0, None]) + '\n')
+        positions[key] = target
+    return ''.join(lines).encode()
+
+def replay(objects, events):
+    TestChart = make_chart(deep_chart_attrs(10))
+    journal = cycle_journal(TestChart, objects, events)
+    def operation():
+        Replay(TestChart).read(io.BytesIO(journal))
+    return operation
+
+@benchmark('replay/1k_objects_10k_events')
+def replay_10k():
+    return replay(1000, 10000)
+
+@benchmark('replay/1k_objects_100k_events')
+def replay_100k():
+    return replay(1000, 100000)
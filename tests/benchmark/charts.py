@@ -0,0 +1,98 @@
+from util.import_relative import enable_imports
+enable_imports(__file__, '../../src')
+
+from levee import Chart, State, Condition, Effect
+
+def make_states(count, prefix='S'):
+    return [type(f'{prefix}{i}', (State,), {}) for i in range(count)]
+
+def state_attrs(states):
+    return { state.__name__: state for state in states }
+
+def wide_chart_attrs(width):
+    """A ROOT State with `width` transitions away from it, each leading back"""
+    root, *leaves = make_states(width + 1)
+    chart = { root: { leaf: ... for leaf in leaves } }
+    chart.update({ leaf: { root: ... } for leaf in leaves })
+    return { **state_attrs([root, *leaves]), 'chart': chart }
+
+def deep_chart_attrs(depth):
+    """A cycle of `depth` States declared through nested transition entries"""
+    states = make_states(depth)
+    entry = { states[0]: ... }
+    for state in reversed(states[1:]):
+        entry = { state: entry }
+    return { **state_attrs(states), 'chart': { states[0]: entry } }
+
+def generated_chart_attrs(state_count, transition_count):
+    """A flat chart where each State has `transition_count / state_count` exits"""
+    states = make_states(state_count)
+    exits = transition_count // state_count
+    chart = {
+        state: {
+            states[(i + step) % state_count]: ...
+            for step in range(1, exits + 1)
+        }
+        for i, state in enumerate(states)
+    }
+    return { **state_attrs(states), 'chart': chart }
+
+def generated_spec(state_count, transition_count):
+    """The transitions of `generated_chart_attrs` as `Chart.from_spec` data"""
+    exits = transition_count // state_count
+    return {
+        f'S{i}': { f'S{(i + step) % state_count}': None for step in range(1, exits + 1) }
+        for i in range(state_count)
+    }
+
+def make_chart(attrs, name='GeneratedChart'):
+    return type(name, (Chart,), attrs)
+
+class Yes(Condition):
+
+    def eval(self, yes):
+        return yes
+
+class No(Condition):
+
+    def eval(self, no):
+        return no if no else 'No'
+
+class Noop(Effect):
+
+    def exec(self, whatever):
+        pass
+
+def condition_tree(depth):
+    """A balanced tree of `&`, `|` and `~` with 2 ** depth Conditions"""
+    if depth == 0:
+        return Yes
+    left = condition_tree(depth - 1)
+    right = condition_tree(depth - 1)
+    if depth % 3 == 0:
+        return ~(left & No) | right
+    if depth % 2 == 0:
+        return left | right
+    return left & right
+
+def effect_chain(length):
+    """`Noop + Noop + ...` with `length` Effects"""
+    chain = Noop
+    for _ in range(length - 1):
+        chain = chain + Noop
+    return chain
+
+def expression_chart(condition=None, effect=None, slotted=False):
+    """ALPHA and BETA transitioning back and forth with the given Condition and Effect"""
+    alpha, beta = make_states(2, 'X')
+    to_beta = beta(condition) if condition is not None else beta(conditionless=True)
+    if effect is not None:
+        to_beta = to_beta[effect]
+    return make_chart({
+        **state_attrs([alpha, beta]),
+        'slotted': slotted,
+        'chart': {
+            alpha: { to_beta: ... },
+            beta: { alpha: ... },
+        },
+    }, 'ExpressionChart')
@@ -0,0 +1,79 @@
+import gc
+import json
+import time
+import tracemalloc
+
+BENCHMARKS = {}
+
+def benchmark(name):
+    """
+    Register a benchmark by name. The decorated function does any setup
+    and returns the zero argument callable to be measured.
+    """
+    def register(setup):
+        BENCHMARKS[name] = setup
+        return setup
+    return register
+
+def peak_bytes(operation):
+    """Peak memory allocated while running the operation once"""
+    gc.collect()
+    tracemalloc.start()
+    try:
+        tracemalloc.reset_peak()
+        start, _ = tracemalloc.get_traced_memory()
+        operation()
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    return max(peak - start, 0)
+
+def ops_per_sec(operation, min_time):
+    """Call the operation in doubling batches until a batch takes min_time"""
+    operation()
+    count = 1
+    while True:
+        start = time.perf_counter()
+        for _ in range(count):
+            operation()
+        elapsed = time.perf_counter() - start
+        if elapsed >= min_time:
+            return count / elapsed
+        count *= 2
+
+def run(pattern='', min_time=0.2, log=print):
+    """Run every registered benchmark containing the pattern, returning their results"""
+    results = {}
+    for name, setup in BENCHMARKS.items():
+        if pattern not in name:
+            continue
+        operation = setup()
+        results[name] = {
+            'ops_per_sec': ops_per_sec(operation, min_time),
+            'peak_bytes': peak_bytes(operation),
+        }
+        log(f'{name:<40} {results[name]["ops_per_sec"]:>14,.1f} ops/sec {results[name]["peak_bytes"]:>10,} peak bytes/op')
+    return results
+
+def save(results, path):
+    with open(path, 'w') as file:
+        json.dump(results, file, indent=2, sort_keys=True)
+
+def compare(results, path, threshold, log=print):
+    """
+    Compare results against a saved baseline, returning the names of the
+    benchmarks that got slower or allocate more by more than the threshold
+    """
+    with open(path) as file:
+        baseline = json.load(file)
+    regressions = []
+    for name, result in results.items():
+        if name not in baseline:
+            continue
+        speed = result['ops_per_sec'] / baseline[name]['ops_per_sec']
+        memory = (result['peak_bytes'] + 1) / (baseline[name]['peak_bytes'] + 1)
+        regressed = speed < 1 - threshold or memory > 1 + threshold
+        if regressed:
+            regressions.append(name)
+        log(f'{name:<40} {speed:>8.2f}x speed {memory:>8.2f}x memory{"  REGRESSION" if regressed else ""}')
+    return regressions
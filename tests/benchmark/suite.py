@@ -0,0 +1,35 @@
+import os
+import sys
+import argparse
+import importlib
+
+from runner import run, save, compare
+
+def load_benchmarks():
+    directory = os.path.abspath(os.path.dirname(__file__))
+    for filename in sorted(os.listdir(directory)):
+        if filename.startswith('bench_') and filename.endswith('.py'):
+            importlib.import_module(filename[:-len('.py')])
+
+def run_suite(argv=None):
+    parser = argparse.ArgumentParser(description='Measure chart construction, transition, can and choices performance')
+    parser.add_argument('pattern', nargs='?', default='', help='only run benchmarks containing this')
+    parser.add_argument('--min-time', type=float, default=0.2, help='seconds to spend measuring each benchmark')
+    parser.add_argument('--save', metavar='PATH', help='save the results as a baseline')
+    parser.add_argument('--compare', metavar='PATH', help='compare the results against a saved baseline')
+    parser.add_argument('--threshold', type=float, default=0.2, help='fraction of slowdown allowed before reporting a regression')
+    args = parser.parse_args(argv)
+
+    load_benchmarks()
+    results = run(args.pattern, args.min_time)
+    if args.save:
+        save(results, args.save)
+    if args.compare:
+        regressions = compare(results, args.compare, args.threshold)
+        if regressions:
+            print(f'{len(regressions)} benchmark(s) regressed: {", ".join(regressions)}')
+            return 1
+    return 0
+
+if __name__ == '__main__':
+    sys.exit(run_suite())
@@ -0,0 +1,95 @@
+from util.import_relative import enable_imports
+enable_imports(__file__, '../../src')
+
+import asyncio
+import unittest
+from unittest.mock import Mock, call
+from levee import Chart, State, Condition, Effect
+from levee.exceptions import TransitionError, TransitionMissingArgs, TransitionNotAllowed
+
+mockFn = Mock()
+
+class TestChart(Chart):
+    class ALPHA(State): pass
+    class BETA(State): pass
+    class GAMMA(State): pass
+
+    class Waits(Condition):
+
+        async def eval(self, event):
+            await asyncio.wait_for(event.wait(), 1)
+            return True
+
+    class Signals(Condition):
+
+        async def eval(self, event, signal):
+            event.set()
+            return signal if signal else 'No signal'
+
+    class Sometimes(Condition):
+
+        def eval(self, sometimes):
+            return sometimes
+
+    class AsyncMock(Effect):
+
+        async def exec(self, whatever):
+            await asyncio.sleep(0)
+            mockFn('async', whatever)
+
+    class CallMock(Effect):
+
+        def exec(self, whatever):
+            mockFn('sync', whatever)
+
+    chart = {
+        ALPHA: {
+            BETA ((Waits & Signals) | Sometimes) [AsyncMock + CallMock + AsyncMock]: ...,
+            GAMMA (Sometimes): ...,
+        },
+        BETA: {
+            ALPHA: ...,
+        },
+        GAMMA: {},
+    }
+
+class Tests(unittest.IsolatedAsyncioTestCase):
+
+    def setUp(self):
+        self.data = { 'state': None }
+        self.chart = TestChart(self.data)
+        mockFn.reset_mock()
+
+    def test_detection(self):
+        self.assertTrue(TestChart.Waits.is_async)
+        self.assertFalse(TestChart.Sometimes.is_async)
+        self.assertTrue(TestChart.plans[TestChart.ALPHA]['BETA'].is_async)
+        self.assertFalse(TestChart.plans[TestChart.ALPHA]['GAMMA'].is_async)
+
+    def test_sync_methods_refuse(self):
+        self.assertRaises(TransitionError, self.chart.to, TestChart.BETA, event=None, signal=True, sometimes=True, whatever=1)
+        self.assertRaises(TransitionError, self.chart.can, TestChart.BETA, event=None, signal=True, sometimes=True, whatever=1)
+        self.assertEqual(self.data['state'], 'ALPHA')
+
+    async def test_ato(self):
+        kwargs = { 'signal': True, 'sometimes': False, 'whatever': 1 }
+        self.assertEqual(await self.chart.acan(TestChart.BETA, event=asyncio.Event(), **kwargs), True)
+        await self.chart.ato(TestChart.BETA, event=asyncio.Event(), **kwargs)
+        self.assertEqual(self.data['state'], 'BETA')
+        self.assertEqual(mockFn.call_args_list, [call('async', 1), call('sync', 1), call('async', 1)])
+        await self.chart.ato(TestChart.ALPHA)
+        self.assertEqual(self.data['state'], 'ALPHA')
+
+    async def test_blocked(self):
+        kwargs = { 'signal': False, 'sometimes': False, 'whatever': 1 }
+        with self.assertRaises(TransitionNotAllowed):
+            await self.chart.ato(TestChart.BETA, event=asyncio.Event(), **kwargs)
+        with self.assertRaises(TransitionMissingArgs):
+            await self.chart.acan(TestChart.BETA, event=asyncio.Event())
+        mockFn.assert_not_called()
+
+    async def test_achoices(self):
+        choices = await self.chart.achoices(event=asyncio.Event(), signal=False, sometimes=True, whatever=1)
+        self.assertEqual(choices, (('BETA', 'Beta'), ('GAMMA', 'Gamma')))
+        results = await self.chart.aexplain_choices(event=asyncio.Event(), signal=False, sometimes=False, whatever=1)
+        self.assertEqual(results[0].reason, 'No signal and False')
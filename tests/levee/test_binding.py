@@ -0,0 +1,73 @@
+from util.import_relative import enable_imports
+enable_imports(__file__, '../../src')
+
+import unittest
+import weakref
+from levee import Chart, State
+
+class TestChart(Chart):
+    class ALPHA(State): pass
+    class BETA(State): pass
+
+    chart = {
+        ALPHA: {
+            BETA: ...,
+        },
+        BETA: {},
+    }
+
+class SlottedChart(Chart):
+    slotted = True
+
+    class ALPHA(State): pass
+
+    chart = {
+        ALPHA: {},
+    }
+
+class NoteChart(SlottedChart):
+    __slots__ = ('note',)
+    ALPHA = SlottedChart.ALPHA
+    chart = SlottedChart.chart
+
+class UserChart(TestChart):
+    ALPHA = TestChart.ALPHA
+    BETA = TestChart.BETA
+    chart = TestChart.chart
+
+    def __init__(self, stateful_object, user):
+        super().__init__(stateful_object)
+        self.user = user
+
+class DataObject:
+
+    def __init__(self, status=None):
+        self.status = status
+
+class Tests(unittest.TestCase):
+
+    def test_not_slotted_by_default(self):
+        chart = UserChart({ 'state': None }, 'someone')
+        self.assertEqual(chart.user, 'someone')
+        self.assertIs(weakref.ref(chart)(), chart)
+        chart.other = 1
+        self.assertEqual(chart.state, UserChart.ALPHA)
+
+    def test_slotted(self):
+        chart = SlottedChart({ 'state': None })
+        self.assertFalse(hasattr(chart, '__dict__'))
+        self.assertRaises(AttributeError, setattr, chart, 'other', 1)
+
+    def test_own_slots(self):
+        chart = NoteChart({ 'state': None })
+        chart.note = 'note'
+        self.assertEqual(chart.note, 'note')
+        self.assertEqual(chart.state, NoteChart.ALPHA)
+        self.assertRaises(AttributeError, setattr, chart, 'other', 1)
+
+    def test_shared_storage(self):
+        self.assertIs(TestChart({ 'state': None }).storage, TestChart({ 'state': 'BETA' }).storage)
+        first, second = DataObject(), DataObject('BETA')
+        self.assertIs(TestChart(first, 'status').storage, TestChart(second, 'status').storage)
+        self.assertEqual(first.status, 'ALPHA')
+        self.assertEqual(second.status, 'BETA')
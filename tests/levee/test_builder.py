@@ -0,0 +1,110 @@
+from util.import_relative import enable_imports
+enable_imports(__file__, '../../src')
+
+import unittest
+from unittest.mock import Mock, call
+from levee import Chart, ChartBuilder, Condition, Effect, State
+from levee.exceptions import ChartSyntaxError, TransitionMissingArgs, TransitionNotAllowed
+
+mockFn = Mock()
+
+class Sometimes(Condition):
+
+    def eval(self, sometimes):
+        return sometimes
+
+class Maybe(Condition):
+
+    def eval(self, maybe):
+        return maybe if maybe else 'I guess not'
+
+class CallMock(Effect):
+
+    def exec(self, whatever):
+        mockFn(whatever)
+
+TestChart = Chart.from_spec('TestChart', {
+    'states': ['ALPHA', 'BETA'],
+    'transitions': {
+        'ALPHA': {
+            'BETA': { 'condition': f'{__name__}:Sometimes', 'effect': 'CallMock' },
+        },
+        'BETA': {
+            'ALPHA': { 'condition': ['and', 'Sometimes', ['or', 'Maybe', ['not', 'Sometimes']]], 'effect': ['CallMock', CallMock] },
+        },
+    },
+}, references={ 'Sometimes': Sometimes, 'Maybe': Maybe, 'CallMock': CallMock })
+
+class Tests(unittest.TestCase):
+
+    def setUp(self):
+        self.data = { 'state': None }
+        self.chart = TestChart(self.data)
+        mockFn.reset_mock()
+
+    def test_structure(self):
+        self.assertTrue(issubclass(TestChart, Chart))
+        self.assertEqual(TestChart.state_values, ('ALPHA', 'BETA'))
+        self.assertIs(TestChart.initial_state, TestChart.ALPHA)
+        self.assertEqual(str(TestChart.transitions[TestChart.ALPHA]['BETA']), 'BETA (Sometimes) [CallMock]')
+        self.assertEqual(
+            str(TestChart.transitions[TestChart.BETA]['ALPHA']),
+            'ALPHA (Sometimes & (Maybe | ~Sometimes)) [CallMock + CallMock]',
+        )
+
+    def test_transitions(self):
+        self.assertRaises(TransitionMissingArgs, self.chart.to, TestChart.BETA, sometimes=True)
+        self.chart.to(TestChart.BETA, sometimes=True, whatever='once')
+        self.assertRaises(TransitionNotAllowed, self.chart.to, TestChart.ALPHA, sometimes=True, maybe=False, whatever='twice')
+        self.chart.to(TestChart.ALPHA, sometimes=True, maybe=True, whatever='twice')
+        mockFn.assert_has_calls((call('once'), call('twice'), call('twice')))
+
+    def test_builder(self):
+        BuiltChart = ChartBuilder('BuiltChart', short_circuit=True) \
+            .transition('ALPHA', 'BETA', condition=Sometimes) \
+            .transition('BETA', 'ALPHA') \
+            .state('GAMMA') \
+            .build()
+        self.assertTrue(BuiltChart.short_circuit)
+        self.assertEqual(BuiltChart.state_values, ('ALPHA', 'BETA', 'GAMMA'))
+        chart = BuiltChart(self.data)
+        self.assertEqual(chart.choices(sometimes=True), (('BETA', 'Beta'),))
+
+    def test_shared_transitions(self):
+        SharedChart = Chart.from_spec('SharedChart', {
+            'transitions': {
+                'ALPHA': { 'GAMMA': None, 'BETA': { 'condition': 'Sometimes' } },
+                'BETA': { 'GAMMA': None, 'ALPHA': { 'condition': 'Sometimes' } },
+                'GAMMA': { 'BETA': { 'condition': 'Sometimes' } },
+            },
+        }, references={ 'Sometimes': Sometimes })
+        plans = SharedChart.plans
+        self.assertIs(plans[SharedChart.ALPHA]['GAMMA'].transition, plans[SharedChart.BETA]['GAMMA'].transition)
+        self.assertIs(plans[SharedChart.ALPHA]['BETA'].transition, plans[SharedChart.GAMMA]['BETA'].transition)
+        self.assertIs(plans[SharedChart.ALPHA]['BETA'].condition, plans[SharedChart.GAMMA]['BETA'].condition)
+        self.assertEqual(plans[SharedChart.BETA]['ALPHA'].required_params, {'sometimes'})
+        chart = SharedChart({ 'state': None })
+        self.assertEqual(chart.choices(sometimes=False), (('GAMMA', 'Gamma'),))
+
+    def test_state_hooks(self):
+        Guarded = type('GUARDED', (State,), { 'to_enter': Maybe, 'on_exit': CallMock })
+        HookChart = ChartBuilder('HookChart') \
+            .transition('ALPHA', Guarded) \
+            .transition(Guarded, 'ALPHA') \
+            .transition('BETA', Guarded) \
+            .build()
+        self.assertIs(HookChart.GUARDED, Guarded)
+        chart = HookChart(self.data)
+        self.assertEqual(chart.explain('GUARDED', maybe=False).reason, 'I guess not')
+        chart.to('GUARDED', maybe=True)
+        chart.to('ALPHA', whatever='exit')
+        mockFn.assert_called_once_with('exit')
+        self.assertEqual(HookChart.plans[HookChart.BETA]['GUARDED'].required_params, {'maybe'})
+
+    def test_errors(self):
+        self.assertRaises(ChartSyntaxError, ChartBuilder('BadChart').transition('ALPHA', 'BETA', condition='missing.module:Nope').build)
+        self.assertRaises(ChartSyntaxError, ChartBuilder('BadChart').transition('ALPHA', 'BETA', condition=CallMock).build)
+        self.assertRaises(ChartSyntaxError, ChartBuilder('BadChart').transition('ALPHA', 'BETA', condition=['xor', Sometimes]).build)
+        self.assertRaises(ChartSyntaxError, ChartBuilder('BadChart').transition('ALPHA', 'BETA', effect=Sometimes).build)
+        self.assertRaises(ChartSyntaxError, ChartBuilder('BadChart').state, 'lowercase')
+        self.assertRaises(ChartSyntaxError, ChartBuilder('BadChart').state(type('lowercase', (State,), {})).build)
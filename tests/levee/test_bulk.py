@@ -0,0 +1,99 @@
+from util.import_relative import enable_imports
+enable_imports(__file__, '../../src')
+
+import unittest
+from unittest.mock import Mock
+from levee import Chart, State, Condition, Effect
+from levee.batch import BatchResult
+
+conditionFn = Mock()
+effectFn = Mock()
+
+class DataObject:
+
+    def __init__(self, state=None):
+        self.state = state
+
+class TestChart(Chart):
+    class PENDING(State): pass
+    class PACKED(State): pass
+    class SHIPPED(State): pass
+
+    class InStock(Condition):
+        pure = True
+        cache_size = 0
+
+        def eval(self, in_stock):
+            conditionFn(in_stock)
+            return in_stock if in_stock else 'Out of stock'
+
+    class Notify(Effect):
+
+        def exec(self, carrier):
+            effectFn(carrier)
+
+    class NotifyCarrier(Effect):
+
+        def exec(self, carrier):
+            effectFn(carrier)
+
+        def exec_batch(self, objects, carrier):
+            effectFn(carrier, objects)
+
+    chart = {
+        PENDING: {
+            PACKED: ...,
+            SHIPPED (InStock) [Notify]: ...,
+        },
+        PACKED: {
+            SHIPPED (InStock) [NotifyCarrier]: ...,
+        },
+        SHIPPED: {},
+    }
+
+class Tests(unittest.TestCase):
+
+    def setUp(self):
+        conditionFn.reset_mock()
+        effectFn.reset_mock()
+
+    def test_moved(self):
+        rows = [{ 'state': None }, { 'state': 'PENDING' }, DataObject('PACKED')]
+        results = TestChart.bulk_to(rows, TestChart.SHIPPED, in_stock=True, carrier='post')
+        self.assertEqual([result.status for result in results], [BatchResult.MOVED] * 3)
+        self.assertTrue(all(results))
+        self.assertEqual(rows[0]['state'], 'SHIPPED')
+        self.assertEqual(rows[2].state, 'SHIPPED')
+        self.assertEqual(conditionFn.call_count, 2)
+        self.assertEqual(effectFn.call_count, 3)
+
+    def test_blocked_and_missing(self):
+        rows = [{ 'state': 'PENDING' }, { 'state': 'SHIPPED' }, { 'state': 'LOST' }, { 'state': 'PACKED' }]
+        results = TestChart.bulk_to(rows, 'SHIPPED', in_stock=False, carrier='post')
+        self.assertEqual(
+            [result.status for result in results],
+            [BatchResult.BLOCKED, BatchResult.NO_TRANSITION, BatchResult.NO_TRANSITION, BatchResult.BLOCKED],
+        )
+        self.assertEqual(results[0].reason, 'Out of stock')
+        self.assertEqual(rows[0]['state'], 'PENDING')
+        effectFn.assert_not_called()
+        results = TestChart.bulk_to(rows, 'SHIPPED', in_stock=True)
+        self.assertEqual(results[0].status, BatchResult.BLOCKED)
+        self.assertEqual(results[0].reason, 'Missing arguments carrier')
+
+    def test_batch_effects(self):
+        rows = [{ 'state': 'PENDING' } for _ in range(10)]
+        TestChart.bulk_to(rows, TestChart.SHIPPED, batch_effects=True, in_stock=True, carrier='post')
+        effectFn.assert_called_once_with('post')
+        conditionFn.assert_called_once_with(True)
+
+    def test_batch_effects_objects(self):
+        rows = [{ 'state': 'PACKED' }, { 'state': 'SHIPPED' }, { 'state': 'PACKED' }, { 'state': 'PENDING' }]
+        results = TestChart.bulk_to(rows, 'SHIPPED', batch_effects=True, in_stock=True, carrier='post')
+        self.assertEqual(
+            [result.status for result in results],
+            [BatchResult.MOVED, BatchResult.NO_TRANSITION, BatchResult.MOVED, BatchResult.MOVED],
+        )
+        self.assertEqual(effectFn.call_count, 2)
+        effectFn.assert_any_call('post', (rows[0], rows[2]))
+        effectFn.assert_any_call('post')
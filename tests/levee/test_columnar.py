@@ -0,0 +1,84 @@
+from util.import_relative import enable_imports
+enable_imports(__file__, '../../src')
+
+import unittest
+from unittest.mock import Mock
+from levee import Chart, State, Condition, Effect
+from levee.exceptions import LeveeException, TransitionMissingArgs
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
+mockFn = Mock()
+
+class TestChart(Chart):
+    class IDLE(State): pass
+    class WALKING(State): pass
+    class RUNNING(State): pass
+
+    class Rested(Condition):
+
+        def eval(self, energy):
+            return energy > 50
+
+    class Allowed(Condition):
+
+        def eval(self, allowed):
+            return allowed
+
+    class CallMock(Effect):
+
+        def exec(self):
+            mockFn()
+
+    chart = {
+        IDLE: {
+            WALKING: ...,
+            RUNNING (Rested & Allowed) [CallMock]: ...,
+        },
+        WALKING: {
+            IDLE: ...,
+            RUNNING (Rested | ~Allowed): ...,
+        },
+        RUNNING: {
+            WALKING: ...,
+        },
+    }
+
+@unittest.skipIf(numpy is None, 'NumPy is not installed')
+class Tests(unittest.TestCase):
+
+    def setUp(self):
+        mockFn.reset_mock()
+
+    def test_adjacency_matrix(self):
+        codes = TestChart.state_codes
+        matrix = TestChart.adjacency_matrix()
+        self.assertEqual(matrix.shape, (3, 3))
+        self.assertEqual(int(matrix.sum()), 5)
+        self.assertTrue(matrix[codes['IDLE'], codes['RUNNING']])
+        self.assertFalse(matrix[codes['RUNNING'], codes['IDLE']])
+        self.assertIs(TestChart.adjacency_matrix(), matrix)
+
+    def test_to_many(self):
+        codes = numpy.array([0, 1, 2, 0, 1], dtype=numpy.int8)
+        energy = numpy.array([80, 80, 80, 10, 10])
+        new_codes, moved = TestChart.to_many(codes, TestChart.RUNNING, energy=energy, allowed=True)
+        self.assertEqual(new_codes.tolist(), [2, 2, 2, 0, 1])
+        self.assertEqual(moved.tolist(), [True, True, False, False, False])
+        self.assertEqual(new_codes.dtype, codes.dtype)
+        self.assertEqual(codes.tolist(), [0, 1, 2, 0, 1])
+        mockFn.assert_called_once_with()
+
+    def test_to_many_mask(self):
+        codes = numpy.array([0, 0, 2, 0])
+        mask = numpy.array([True, False, True, True])
+        new_codes, moved = TestChart.to_many(codes, 'WALKING', mask=mask)
+        self.assertEqual(new_codes.tolist(), [1, 0, 1, 1])
+        self.assertEqual(moved.tolist(), [True, False, True, True])
+
+    def test_to_many_errors(self):
+        self.assertRaises(TransitionMissingArgs, TestChart.to_many, numpy.array([0]), 'RUNNING', energy=100)
+        self.assertRaises(LeveeException, TestChart.to_many, numpy.array([3]), 'RUNNING')
+        self.assertRaises(LeveeException, TestChart.to_many, numpy.array([-1]), 'RUNNING')
@@ -0,0 +1,80 @@
+from util.import_relative import enable_imports
+enable_imports(__file__, '../../src')
+
+import threading
+import unittest
+from concurrent.futures import ThreadPoolExecutor
+from unittest.mock import Mock
+from levee import Chart, State, Condition
+from levee.exceptions import TransitionMissingArgs
+
+mockFn = Mock()
+barrier = None
+
+class TestChart(Chart):
+    class ALPHA(State): pass
+    class BETA(State): pass
+    class GAMMA(State): pass
+    class DELTA(State): pass
+
+    class Sometimes(Condition):
+
+        def eval(self, sometimes):
+            mockFn('Sometimes')
+            barrier.wait()
+            return sometimes
+
+    class Maybe(Condition):
+
+        def eval(self, maybe):
+            mockFn('Maybe')
+            barrier.wait()
+            return maybe if maybe else 'I guess not'
+
+    class Always(Condition):
+
+        def eval(self):
+            mockFn('Always')
+            barrier.wait()
+            return True
+
+    chart = {
+        ALPHA: {
+            BETA (Sometimes): ...,
+            GAMMA (Sometimes | Maybe): ...,
+            DELTA (Always & ~Maybe): ...,
+        },
+        BETA: {},
+        GAMMA: {},
+        DELTA: {},
+    }
+
+class Tests(unittest.TestCase):
+
+    def setUp(self):
+        self.chart = TestChart({ 'state': None })
+        self.executor = ThreadPoolExecutor(max_workers=3)
+        mockFn.reset_mock()
+        global barrier
+        barrier = threading.Barrier(3, timeout=1)
+
+    def tearDown(self):
+        self.executor.shutdown()
+
+    def test_parallel_and_deduplicated(self):
+        choices = self.chart.choices(executor=self.executor, sometimes=False, maybe=False)
+        self.assertEqual(choices, (('DELTA', 'Delta'),))
+        self.assertEqual(sorted(call.args[0] for call in mockFn.call_args_list), ['Always', 'Maybe', 'Sometimes'])
+
+    def test_declared_order(self):
+        results = self.chart.explain_choices(executor=self.executor, sometimes=True, maybe=True)
+        self.assertEqual([result.target for result in results], [TestChart.BETA, TestChart.GAMMA, TestChart.DELTA])
+        self.assertEqual([result.allowed for result in results], [True, True, False])
+
+    def test_missing(self):
+        global barrier
+        barrier = threading.Barrier(1)
+        self.assertRaises(TransitionMissingArgs, self.chart.choices, executor=self.executor, sometimes=True)
+        results = self.chart.explain_choices(executor=self.executor, sometimes=True)
+        self.assertEqual(results[0].allowed, True)
+        self.assertEqual(results[1].missing, ('maybe',))
@@ -0,0 +1,79 @@
+from util.import_relative import enable_imports
+enable_imports(__file__, '../../src')
+
+import unittest
+from levee import Chart, State, Condition
+from levee.exceptions import TransitionDoesNotExist
+
+class TestChart(Chart):
+    class ALPHA(State): pass
+    class BETA(State): pass
+    class GAMMA(State): pass
+    class DELTA(State): pass
+
+    class Sometimes(Condition):
+
+        def eval(self, sometimes):
+            return sometimes
+
+    class Maybe(Condition):
+
+        def eval(self, maybe):
+            return maybe if maybe else 'I guess not'
+
+    chart = {
+        ALPHA: {
+            BETA (Sometimes): ...,
+            GAMMA (Maybe): ...,
+            DELTA: ...,
+        },
+        BETA: {},
+        GAMMA: {},
+        DELTA: {},
+    }
+
+class CountingObject:
+
+    def __init__(self):
+        self.reads = 0
+        self._state = None
+
+    @property
+    def state(self):
+        self.reads += 1
+        return self._state
+
+    @state.setter
+    def state(self, value):
+        self._state = value
+
+class Tests(unittest.TestCase):
+
+    def setUp(self):
+        self.data = { 'state': None }
+        self.chart = TestChart(self.data)
+
+    def test_explain(self):
+        result = self.chart.explain(TestChart.GAMMA, maybe=False)
+        self.assertFalse(result)
+        self.assertEqual(result.reason, 'I guess not')
+        self.assertEqual(result.missing, ())
+        self.assertIs(result.target, TestChart.GAMMA)
+        result = self.chart.explain(TestChart.BETA)
+        self.assertFalse(result.allowed)
+        self.assertEqual(result.missing, ('sometimes',))
+        self.assertTrue(self.chart.explain(TestChart.DELTA))
+        self.assertRaises(TransitionDoesNotExist, self.chart.explain, TestChart.ALPHA)
+
+    def test_explain_choices(self):
+        results = self.chart.explain_choices(sometimes=True)
+        self.assertEqual([result.target for result in results], [TestChart.BETA, TestChart.GAMMA, TestChart.DELTA])
+        self.assertEqual([result.allowed for result in results], [True, False, True])
+        self.assertEqual(results[1].missing, ('maybe',))
+
+    def test_state_read_once(self):
+        obj = CountingObject()
+        chart = TestChart(obj)
+        obj.reads = 0
+        self.assertEqual(len(chart.choices(sometimes=True, maybe=False)), 2)
+        self.assertEqual(obj.reads, 1)
@@ -0,0 +1,125 @@
+from util.import_relative import enable_imports
+enable_imports(__file__, '../../src')
+
+import random
+import unittest
+from unittest.mock import Mock
+from levee import Chart, State, Condition
+
+mockFn = Mock()
+
+class TestChart(Chart):
+    class ORDERED(State): pass
+    class PAID(State): pass
+    class SHIPPED(State): pass
+    class DELIVERED(State): pass
+    class CANCELLED(State): pass
+    class RETURNED(State): pass
+    class ARCHIVED(State): pass
+
+    class Paid(Condition):
+
+        def eval(self, paid):
+            mockFn('Paid')
+            return paid
+
+    class Express(Condition):
+
+        def eval(self, express):
+            mockFn('Express')
+            return express
+
+    class Never(Condition):
+
+        def eval(self):
+            mockFn('Never')
+            return False
+
+    chart = {
+        ORDERED: {
+            PAID (Paid): {
+                SHIPPED: {
+                    DELIVERED: {
+                        RETURNED: {
+                            PAID: ...,
+                        },
+                    },
+                },
+                DELIVERED (Express): ...,
+            },
+            CANCELLED (Never): {},
+        },
+    }
+
+def naive_reachable(chart_class, state):
+    seen = set()
+    stack = [state]
+    while stack:
+        for to_value in chart_class.plans.get(stack.pop(), {}):
+            to_state = chart_class.state_index[to_value]
+            if to_state not in seen:
+                seen.add(to_state)
+                stack.append(to_state)
+    return seen
+
+class Tests(unittest.TestCase):
+
+    def setUp(self):
+        mockFn.reset_mock()
+
+    def test_class_facts(self):
+        self.assertEqual(TestChart.terminal_states, (TestChart.CANCELLED, TestChart.ARCHIVED))
+        self.assertEqual(TestChart.unreachable_states, (TestChart.ARCHIVED,))
+
+    def test_reachability(self):
+        self.assertTrue(TestChart.can_reach('ORDERED', 'DELIVERED'))
+        self.assertTrue(TestChart.can_reach(TestChart.PAID, TestChart.PAID))
+        self.assertFalse(TestChart.can_reach('ORDERED', 'ORDERED'))
+        self.assertFalse(TestChart.can_reach('CANCELLED', 'PAID'))
+        self.assertEqual(
+            TestChart.reachable_states('RETURNED'),
+            (TestChart.PAID, TestChart.SHIPPED, TestChart.DELIVERED, TestChart.RETURNED),
+        )
+
+    def test_shortest_path(self):
+        self.assertEqual(
+            TestChart.shortest_path('ORDERED', 'DELIVERED'),
+            (TestChart.ORDERED, TestChart.PAID, TestChart.DELIVERED),
+        )
+        self.assertEqual(TestChart.shortest_path('PAID', 'PAID'), (TestChart.PAID,))
+        self.assertIsNone(TestChart.shortest_path('DELIVERED', 'ORDERED'))
+
+    def test_path_to(self):
+        chart = TestChart({ 'state': None })
+        self.assertEqual(
+            chart.path_to('DELIVERED', paid=True, express=False),
+            (TestChart.ORDERED, TestChart.PAID, TestChart.SHIPPED, TestChart.DELIVERED),
+        )
+        self.assertNotIn('Never', [call.args[0] for call in mockFn.call_args_list])
+        self.assertEqual(
+            chart.path_to('DELIVERED', paid=True, express=True),
+            (TestChart.ORDERED, TestChart.PAID, TestChart.DELIVERED),
+        )
+        self.assertIsNone(chart.path_to('DELIVERED', paid=False, express=True))
+        self.assertIsNone(chart.path_to('ARCHIVED'))
+
+    def test_random_charts(self):
+        rng = random.Random(7)
+        for _ in range(20):
+            states = [type(f'S{i}', (State,), {}) for i in range(30)]
+            chart = {
+                state: { target: ... for target in rng.sample(states, rng.randint(0, 3)) }
+                for state in states
+            }
+            RandomChart = type('RandomChart', (Chart,), { **{ state.__name__: state for state in states }, 'chart': chart })
+            for state in states:
+                expected = naive_reachable(RandomChart, state)
+                self.assertEqual(set(RandomChart.reachable_states(state)), expected)
+
+    def test_deep_chart(self):
+        states = [type(f'S{i}', (State,), {}) for i in range(5000)]
+        chart = { state: { target: ... } for state, target in zip(states, states[1:]) }
+        chart[states[-1]] = { states[0]: ... }
+        DeepChart = type('DeepChart', (Chart,), { **{ state.__name__: state for state in states }, 'chart': chart })
+        self.assertEqual(len(DeepChart.reachable_states('S0')), 5000)
+        self.assertEqual(len(DeepChart.shortest_path('S1', 'S0')), 5000)
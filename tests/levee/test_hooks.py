@@ -0,0 +1,106 @@
+from util.import_relative import enable_imports
+enable_imports(__file__, '../../src')
+
+import unittest
+from unittest.mock import Mock, call
+from levee import Chart, State, Condition, Effect
+from levee.exceptions import ChartSyntaxError, TransitionNotAllowed
+
+mockFn = Mock()
+
+class Unlocked(Condition):
+
+    def eval(self, unlocked):
+        mockFn('Unlocked')
+        return unlocked if unlocked else 'Locked'
+
+class Sometimes(Condition):
+
+    def eval(self, sometimes):
+        mockFn('Sometimes')
+        return sometimes
+
+class Leave(Effect):
+
+    def exec(self):
+        mockFn('Leave')
+
+class Arrive(Effect):
+
+    def exec(self):
+        mockFn('Arrive')
+
+class Edge(Effect):
+
+    def exec(self):
+        mockFn('Edge')
+
+class TestChart(Chart):
+    class ALPHA(State):
+        to_exit = Unlocked
+        on_exit = Leave
+
+    class BETA(State):
+        to_enter = Sometimes
+        on_enter = Arrive + Arrive
+
+    class GAMMA(State): pass
+
+    chart = {
+        ALPHA: {
+            BETA (Sometimes) [Edge]: ...,
+            GAMMA: ...,
+        },
+        BETA: {
+            GAMMA: ...,
+            ALPHA: ...,
+        },
+        GAMMA: {},
+    }
+
+class Tests(unittest.TestCase):
+
+    def setUp(self):
+        self.data = { 'state': None }
+        self.chart = TestChart(self.data)
+        mockFn.reset_mock()
+
+    def test_folded(self):
+        plan = TestChart.plans[TestChart.ALPHA]['BETA']
+        self.assertEqual(str(plan.condition), '((Unlocked & Sometimes) & Sometimes)')
+        self.assertEqual([effect.__class__ for effect in plan.effects], [Leave, Edge, Arrive, Arrive])
+        self.assertEqual(plan.params, { 'unlocked', 'sometimes' })
+        self.assertIsNone(TestChart.plans[TestChart.BETA]['GAMMA'].condition)
+
+    def test_order(self):
+        self.chart.to(TestChart.BETA, unlocked=True, sometimes=True)
+        self.assertEqual(mockFn.call_args_list, [
+            call('Unlocked'), call('Sometimes'),
+            call('Leave'), call('Edge'), call('Arrive'), call('Arrive'),
+        ])
+
+    def test_guards(self):
+        with self.assertRaises(TransitionNotAllowed) as context:
+            self.chart.to(TestChart.GAMMA, unlocked=False)
+        self.assertEqual(str(context.exception), 'Locked')
+        self.assertEqual(self.chart.choices(unlocked=True, sometimes=False), (('GAMMA', 'Gamma'),))
+
+    def test_exit_guard_only(self):
+        self.data['state'] = 'BETA'
+        self.assertIsNone(TestChart.plans[TestChart.BETA]['ALPHA'].condition)
+        self.chart.to(TestChart.ALPHA)
+        self.assertEqual(mockFn.call_args_list, [])
+
+    def test_invalid(self):
+        bad_state = type('BAD', (State,), { 'to_enter': Leave })
+        with self.assertRaisesRegex(ChartSyntaxError, '^BAD: to_enter'):
+            class BadChart(Chart):
+                GAMMA = TestChart.GAMMA
+                BAD = bad_state
+                chart = { GAMMA: { BAD: ... }, BAD: {} }
+        bad_state = type('BAD', (State,), { 'on_enter': TestChart.GAMMA })
+        with self.assertRaisesRegex(ChartSyntaxError, '^BAD: on_enter must be an Effect'):
+            class OtherBadChart(Chart):
+                GAMMA = TestChart.GAMMA
+                BAD = bad_state
+                chart = { GAMMA: { BAD: ... }, BAD: {} }
@@ -0,0 +1,131 @@
+from util.import_relative import enable_imports
+enable_imports(__file__, '../../src')
+
+import os
+import sys
+import json
+import subprocess
+import tempfile
+import time
+import unittest
+from levee import Chart, State, Condition
+from levee.exceptions import TransitionMissingArgs, TransitionNotAllowed
+from levee.journal import JournalEntry, JournalWriter, digest
+from levee.storage import AttributeStorage, DictStorage
+
+entries = []
+
+class DataObject:
+
+    def __init__(self, id, state=None):
+        self.id = id
+        self.state = state
+
+class TestChart(Chart):
+    journal = entries.append
+
+    class ALPHA(State): pass
+    class BETA(State): pass
+
+    class Sometimes(Condition):
+
+        def eval(self, sometimes):
+            return sometimes if sometimes else 'Not this time'
+
+    chart = {
+        ALPHA: {
+            BETA (Sometimes): ...,
+        },
+        BETA: {
+            ALPHA: ...,
+        },
+    }
+
+class Tests(unittest.TestCase):
+
+    def setUp(self):
+        entries.clear()
+        self.data = { 'state': None }
+        self.chart = TestChart(self.data)
+
+    def test_entries(self):
+        self.assertRaises(TransitionNotAllowed, self.chart.to, TestChart.BETA, sometimes=False)
+        self.assertRaises(TransitionMissingArgs, self.chart.to, 'BETA')
+        self.chart.to(TestChart.BETA, sometimes=True)
+        self.chart.can(TestChart.ALPHA)
+        self.assertEqual(len(entries), 3)
+        blocked, missing, moved = entries
+        self.assertEqual((blocked.source, blocked.target, blocked.reason), ('ALPHA', 'BETA', 'Not this time'))
+        self.assertEqual(missing.reason, 'TransitionMissingArgs: sometimes')
+        self.assertEqual((moved.key, moved.source, moved.target, moved.reason), (None, 'ALPHA', 'BETA', None))
+        self.assertEqual(moved.digest, digest({ 'sometimes': True }))
+        self.assertGreaterEqual(moved.duration, 0)
+
+    def test_keys(self):
+        row = { 'id': 7, 'state': None }
+        TestChart(row, storage=DictStorage(id_key='id')).to(TestChart.BETA, sometimes=True)
+        obj = DataObject(8)
+        TestChart(obj, storage=AttributeStorage(id_attribute='id')).to(TestChart.BETA, sometimes=True)
+        self.assertEqual([entry.key for entry in entries], [7, 8])
+
+    def test_bulk(self):
+        storage = DictStorage(id_key='id')
+        rows = [{ 'id': 1, 'state': 'ALPHA' }, { 'id': 2, 'state': 'BETA' }, { 'id': 3, 'state': 'OMEGA' }]
+        results = TestChart.bulk_to(rows, 'BETA', storage=storage, sometimes=True)
+        self.assertEqual([result.status for result in results], ['moved', 'no_transition', 'no_transition'])
+        TestChart.bulk_to(rows[1:2], 'ALPHA', storage=storage)
+        TestChart.bulk_to(rows[1:2], 'BETA', storage=storage, sometimes=False)
+        self.assertEqual(
+            [(entry.key, entry.source, entry.target, entry.reason) for entry in entries],
+            [
+                (1, 'ALPHA', 'BETA', None),
+                (2, 'BETA', 'BETA', 'TransitionDoesNotExist: BETA to BETA'),
+                (3, 'OMEGA', 'BETA', 'TransitionDoesNotExist: Unknown state "OMEGA"'),
+                (2, 'BETA', 'ALPHA', None),
+                (2, 'ALPHA', 'BETA', 'Not this time'),
+            ],
+        )
+        self.assertEqual(entries[0].digest, digest({ 'sometimes': True }))
+
+    def test_digest(self):
+        self.assertEqual(digest({ 'a': 1, 'b': 2 }), digest({ 'b': 2, 'a': 1 }))
+        self.assertNotEqual(digest({ 'a': 1 }), digest({ 'a': 2 }))
+        self.assertIsNone(digest({}))
+        self.assertNotEqual(digest({ 'a': 1 }), digest({ 'a': '1' }))
+        self.assertEqual(digest({ 'a': 1, 'connection': object() }), digest({ 'a': 1, 'connection': object() }))
+        self.assertNotEqual(digest({ 'a': 1, 'connection': object() }), digest({ 'a': 1, 'connection': [] }))
+        self.assertEqual(digest({ 'a': 1.5, 'b': None }), 'ba86747835389745')
+
+    def test_writer(self):
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, 'journal.jsonl')
+            with JournalWriter(path, buffer_size=2, flush_interval=60) as writer:
+                for index in range(5):
+                    writer(JournalEntry(index, 'ALPHA', 'BETA', None, 1.0, 0.5))
+            with open(path) as file:
+                lines = [JournalEntry.from_data(json.loads(line)) for line in file]
+        self.assertEqual([entry.key for entry in lines], [0, 1, 2, 3, 4])
+        self.assertEqual(lines[0].data(), [0, 'ALPHA', 'BETA', None, 1.0, 0.5, None])
+
+    def test_writer_exit(self):
+        source = os.path.join(os.path.dirname(os.path.abspath(__file__)), '../../src')
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, 'journal.jsonl')
+            subprocess.run([sys.executable, '-c', (
+                'import sys; sys.path.insert(0, sys.argv[1])\n'
+                'from levee.journal import JournalEntry, JournalWriter\n'
+                'writer = JournalWriter(sys.argv[2], flush_interval=60)\n'
+                'writer(JournalEntry(1, "ALPHA", "BETA", None, 1.0, 0.5))\n'
+            ), source, path], check=True)
+            with open(path) as file:
+                self.assertEqual(len(file.readlines()), 1)
+
+    def test_writer_interval(self):
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, 'journal.jsonl')
+            writer = JournalWriter(path, flush_interval=0.01)
+            writer(JournalEntry(1, 'ALPHA', 'BETA', None, 1.0, 0.5))
+            time.sleep(0.2)
+            with open(path) as file:
+                self.assertEqual(len(file.readlines()), 1)
+            writer.close()
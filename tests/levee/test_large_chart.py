@@ -0,0 +1,31 @@
+from util.import_relative import enable_imports
+enable_imports(__file__, '../../src')
+enable_imports(__file__, '../benchmark')
+
+import unittest
+from levee import Chart
+from levee.exceptions import ChartSyntaxError
+from charts import generated_chart_attrs
+
+class Tests(unittest.TestCase):
+
+    def test_large_chart(self):
+        # How compilation time scales is measured by the construct/generated benchmarks
+        GeneratedChart = type('GeneratedChart', (Chart,), generated_chart_attrs(10000, 100000))
+        self.assertEqual(len(GeneratedChart.states), 10000)
+        self.assertEqual(sum(len(plans) for plans in GeneratedChart.plans.values()), 100000)
+
+        data = { 'state': 'S9999' }
+        chart = GeneratedChart(data)
+        chart.to('S9')
+        self.assertIs(chart.state, GeneratedChart.S9)
+
+    def test_missing_entry(self):
+        attrs = generated_chart_attrs(100, 1000)
+        del attrs['chart'][attrs['S50']]
+        self.assertRaises(ChartSyntaxError, type, 'GeneratedChart', (Chart,), attrs)
+
+    def test_duplicate_entry(self):
+        attrs = generated_chart_attrs(100, 1000)
+        attrs['chart'][attrs['S0']][attrs['S1']] = { attrs['S2']: ... }
+        self.assertRaises(ChartSyntaxError, type, 'GeneratedChart', (Chart,), attrs)
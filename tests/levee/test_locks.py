@@ -0,0 +1,89 @@
+from util.import_relative import enable_imports
+enable_imports(__file__, '../../src')
+
+import threading
+import unittest
+from unittest.mock import Mock
+from levee import Chart, State, Condition, Effect
+from levee.exceptions import TransitionConflict
+from levee.locks import StripedLocks
+
+effectFn = Mock()
+barrier = None
+
+class TestChart(Chart):
+    locks = StripedLocks(4)
+
+    class ALPHA(State): pass
+    class BETA(State): pass
+    class GAMMA(State): pass
+
+    class Together(Condition):
+
+        def eval(self):
+            barrier.wait()
+            return True
+
+    class Interrupted(Condition):
+
+        def eval(self, data):
+            data['state'] = 'GAMMA'
+            return True
+
+    class CallMock(Effect):
+
+        def exec(self):
+            effectFn()
+
+    chart = {
+        ALPHA: {
+            BETA (Together) [CallMock]: ...,
+            GAMMA (Interrupted) [CallMock]: ...,
+        },
+        BETA: {},
+        GAMMA: {},
+    }
+
+class Tests(unittest.TestCase):
+
+    def setUp(self):
+        TestChart.locks.reset()
+        effectFn.reset_mock()
+
+    def test_single_winner(self):
+        global barrier
+        barrier = threading.Barrier(8, timeout=1)
+        data = { 'state': None }
+        outcomes = []
+        def attempt():
+            try:
+                outcomes.append(TestChart(data).to(TestChart.BETA))
+            except TransitionConflict:
+                outcomes.append(TransitionConflict)
+        threads = [threading.Thread(target=attempt) for _ in range(8)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        self.assertEqual(outcomes.count(TestChart.BETA), 1)
+        self.assertEqual(outcomes.count(TransitionConflict), 7)
+        self.assertEqual(effectFn.call_count, 1)
+        self.assertEqual(data['state'], 'BETA')
+        stats = TestChart.locks.stats()
+        self.assertEqual(stats['acquired'], 8)
+        self.assertEqual(stats['conflicts'], 7)
+
+    def test_changed_during_evaluation(self):
+        data = { 'state': None }
+        chart = TestChart(data)
+        self.assertRaises(TransitionConflict, chart.to, TestChart.GAMMA, data=data)
+        effectFn.assert_not_called()
+        self.assertEqual(TestChart.locks.stats()['conflicts'], 1)
+
+    def test_unlocked_by_default(self):
+        self.assertIsNone(Chart.locks)
+
+    def test_stripes(self):
+        locks = StripedLocks(4)
+        self.assertTrue(all(0 <= locks.stripe(object()) < 4 for _ in range(100)))
+        self.assertRaises(ValueError, StripedLocks, 0)
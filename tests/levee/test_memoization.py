@@ -0,0 +1,99 @@
+from util.import_relative import enable_imports
+enable_imports(__file__, '../../src')
+
+import unittest
+from unittest.mock import Mock, patch
+from levee import Chart, State, Condition
+from levee.context import PureCache
+
+mockFn = Mock()
+
+class TestChart(Chart):
+    class ALPHA(State): pass
+    class BETA(State): pass
+    class GAMMA(State): pass
+    class DELTA(State): pass
+
+    class Sometimes(Condition):
+
+        def eval(self, sometimes):
+            mockFn('Sometimes')
+            return sometimes
+
+    class Maybe(Condition):
+
+        def eval(self, maybe):
+            mockFn('Maybe')
+            return maybe if maybe else 'I guess not'
+
+    class Lookup(Condition):
+        pure = True
+        cache_size = 2
+
+        def eval(self, key):
+            mockFn('Lookup', key)
+            return key != 'blocked'
+
+    chart = {
+        ALPHA: {
+            BETA (Sometimes): ...,
+            GAMMA (Sometimes & (Maybe | ~Sometimes)): ...,
+            DELTA (Lookup): ...,
+        },
+        BETA: {},
+        GAMMA: {},
+        DELTA: {},
+    }
+
+class Tests(unittest.TestCase):
+
+    def setUp(self):
+        self.chart = TestChart({ 'state': None })
+        TestChart.Lookup.pure_cache.clear()
+        mockFn.reset_mock()
+
+    def calls(self, name):
+        return [call for call in mockFn.call_args_list if call.args[0] == name]
+
+    def test_shared_across_choices(self):
+        choices = self.chart.choices(sometimes=True, maybe=False, key='a')
+        self.assertEqual(choices, (('BETA', 'Beta'), ('DELTA', 'Delta')))
+        self.assertEqual(len(self.calls('Sometimes')), 1)
+        self.assertEqual(len(self.calls('Maybe')), 1)
+
+    def test_repeated_in_expression(self):
+        self.assertTrue(TestChart.plans[TestChart.ALPHA]['GAMMA'].memoize)
+        self.assertFalse(TestChart.plans[TestChart.ALPHA]['BETA'].memoize)
+        self.assertEqual(self.chart.can(TestChart.GAMMA, sometimes=True, maybe=True), True)
+        self.assertEqual(len(self.calls('Sometimes')), 1)
+
+    def test_not_shared_between_calls(self):
+        self.chart.can(TestChart.BETA, sometimes=True)
+        self.chart.can(TestChart.BETA, sometimes=True)
+        self.assertEqual(len(self.calls('Sometimes')), 2)
+
+    def test_pure_cached_across_calls(self):
+        self.assertIsNone(TestChart.Sometimes.pure_cache)
+        self.assertEqual(self.chart.can(TestChart.DELTA, key='a'), True)
+        self.assertEqual(self.chart.can(TestChart.DELTA, key='a'), True)
+        self.assertEqual(self.chart.can(TestChart.DELTA, key='blocked'), False)
+        self.assertEqual(len(self.calls('Lookup')), 2)
+
+    def test_pure_cache_bounded(self):
+        for key in ('a', 'b', 'c', 'a'):
+            self.chart.can(TestChart.DELTA, key=key)
+        self.assertEqual([call.args[1] for call in self.calls('Lookup')], ['a', 'b', 'c', 'a'])
+
+    def test_unhashable_arguments(self):
+        self.chart.can(TestChart.DELTA, key=['a'])
+        self.chart.can(TestChart.DELTA, key=['a'])
+        self.assertEqual(len(self.calls('Lookup')), 2)
+
+    def test_ttl(self):
+        cache = PureCache(8, ttl=10)
+        with patch('levee.context.monotonic', return_value=100):
+            cache.set('key', False)
+            self.assertEqual(cache.get('key'), (False,))
+        with patch('levee.context.monotonic', return_value=110):
+            self.assertIsNone(cache.get('key'))
+        self.assertIsNone(cache.get('missing'))
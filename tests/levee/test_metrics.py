@@ -0,0 +1,82 @@
+from util.import_relative import enable_imports
+enable_imports(__file__, '../../src')
+
+import json
+import unittest
+from levee import Chart, State, Condition, Effect
+from levee.exceptions import TransitionMissingArgs, TransitionNotAllowed
+from levee.metrics import ChartMetrics, Histogram, OTHER_REASONS
+
+class TestChart(Chart):
+    metrics = ChartMetrics(max_reasons=2)
+
+    class ALPHA(State): pass
+    class BETA(State): pass
+
+    class Sometimes(Condition):
+
+        def eval(self, sometimes):
+            return sometimes
+
+    class Noop(Effect):
+
+        def exec(self):
+            pass
+
+    chart = {
+        ALPHA: {
+            BETA (Sometimes) [Noop]: ...,
+        },
+        BETA: {
+            ALPHA: ...,
+        },
+    }
+
+class Tests(unittest.TestCase):
+
+    def setUp(self):
+        TestChart.metrics.reset()
+        self.chart = TestChart({ 'state': None })
+
+    def edge(self, source, target):
+        for edge in TestChart.export_metrics()['transitions']:
+            if (edge['from'], edge['to']) == (source, target):
+                return edge
+
+    def test_counts(self):
+        for reason in ('One', 'Two', 'Three', 'Three'):
+            self.assertRaises(TransitionNotAllowed, self.chart.to, TestChart.BETA, sometimes=reason)
+        self.assertRaises(TransitionMissingArgs, self.chart.to, TestChart.BETA)
+        self.chart.to(TestChart.BETA, sometimes=True)
+        self.chart.to(TestChart.ALPHA)
+
+        edge = self.edge('ALPHA', 'BETA')
+        self.assertEqual((edge['calls'], edge['moved'], edge['blocked']), (6, 1, 5))
+        self.assertEqual(edge['reasons'], { 'One': 1, 'Two': 1, OTHER_REASONS: 3 })
+        self.assertEqual(edge['condition']['count'], 6)
+        self.assertEqual(edge['effect']['count'], 1)
+        self.assertEqual(edge['lookup']['buckets'][-1], ['+Inf', 6])
+        self.assertEqual(self.edge('BETA', 'ALPHA')['moved'], 1)
+        json.dumps(TestChart.export_metrics())
+
+    def test_unhashable_reason(self):
+        self.assertRaises(TransitionNotAllowed, self.chart.to, TestChart.BETA, sometimes=['Out of stock'])
+        self.assertEqual(self.edge('ALPHA', 'BETA')['reasons'], { "['Out of stock']": 1 })
+
+    def test_dry_run_not_recorded(self):
+        self.chart.can(TestChart.BETA, sometimes=True)
+        self.chart.transition(TestChart.BETA, True, sometimes=True)
+        self.assertEqual(TestChart.export_metrics()['transitions'], [])
+
+    def test_disabled(self):
+        self.assertIsNone(Chart.export_metrics())
+
+    def test_histogram(self):
+        histogram = Histogram((0.1, 1.0))
+        for value in (0.05, 0.1, 0.5, 2.0):
+            histogram.observe(value)
+        self.assertEqual(histogram.export(), {
+            'count': 4,
+            'sum': 2.65,
+            'buckets': [[0.1, 2], [1.0, 3], ['+Inf', 4]],
+        })
@@ -0,0 +1,70 @@
+from util.import_relative import enable_imports
+enable_imports(__file__, '../../src')
+
+import unittest
+from unittest.mock import Mock, call
+from levee import Chart, State, Condition, Effect
+
+mockFn = Mock()
+
+class TestChart(Chart):
+    class ALPHA(State): pass
+    class BETA(State): pass
+
+    class Sometimes(Condition):
+
+        def eval(self, sometimes):
+            return sometimes
+
+    class Maybe(Condition):
+
+        def eval(self, maybe):
+            return maybe if maybe else 'I guess not'
+
+    class Never(Condition):
+
+        def eval(self):
+            return False
+
+    class CallMock(Effect):
+
+        def exec(self, whatever):
+            mockFn(whatever)
+
+    class SayHello(Effect):
+
+        def exec(self):
+            mockFn('Hello!')
+
+    chart = {
+        ALPHA: {
+            BETA ((Sometimes & Maybe) | ~(Never | Sometimes)) [CallMock + SayHello + CallMock]: ...,
+        },
+        BETA: {
+            ALPHA: ...,
+        },
+    }
+
+class Tests(unittest.TestCase):
+
+    def setUp(self):
+        self.data = { 'state': None }
+        self.chart = TestChart(self.data)
+        mockFn.reset_mock()
+
+    def test_nested_condition(self):
+        self.assertEqual(self.chart.can(TestChart.BETA, sometimes=True, maybe=True, whatever=1), True)
+        self.assertEqual(self.chart.can(TestChart.BETA, sometimes=True, maybe=False, whatever=1), False)
+        self.assertEqual(self.chart.can(TestChart.BETA, sometimes=False, maybe=False, whatever=1), True)
+
+    def test_nested_effect(self):
+        self.chart.to(TestChart.BETA, sometimes=False, maybe=False, whatever='whatever')
+        mockFn.assert_has_calls((call('whatever'), call('Hello!'), call('whatever')))
+        self.assertEqual(mockFn.call_count, 3)
+
+    def test_str(self):
+        transition = TestChart.transitions[TestChart.ALPHA]['BETA']
+        self.assertEqual(
+            str(transition),
+            'BETA ((Sometimes & Maybe) | ~(Never | Sometimes)) [CallMock + SayHello + CallMock]',
+        )
@@ -0,0 +1,121 @@
+from util.import_relative import enable_imports
+enable_imports(__file__, '../../src')
+
+import unittest
+from itertools import count
+from unittest.mock import Mock, call, patch
+from levee import Chart, State, Condition, Effect
+from levee.exceptions import TransitionDoesNotExist, TransitionMissingArgs, TransitionNotAllowed
+from levee.metrics import ChartMetrics
+from levee.storage import DictStorage
+
+mockFn = Mock()
+
+class CountingStorage(DictStorage):
+
+    def set(self, obj, value):
+        mockFn('set', value)
+        super().set(obj, value)
+
+class TestChart(Chart):
+    class ORDERED(State): pass
+    class PAID(State): pass
+    class SHIPPED(State): pass
+    class DELIVERED(State): pass
+    class ARCHIVED(State): pass
+
+    class Paid(Condition):
+
+        def eval(self, paid):
+            mockFn('Paid')
+            return paid if paid else 'Not paid'
+
+    class Shippable(Condition):
+
+        def eval(self, shippable):
+            mockFn('Shippable')
+            return shippable if shippable else 'Not shippable'
+
+    class Log(Effect):
+
+        def exec(self, note=None):
+            mockFn('Log', note)
+
+    class Pay(Effect):
+
+        def exec(self):
+            mockFn('Pay')
+
+    class Ship(Effect):
+
+        def exec(self):
+            mockFn('Ship')
+
+    chart = {
+        ORDERED: {
+            PAID (Paid) [Pay]: {
+                SHIPPED (Shippable) [Ship]: {
+                    DELIVERED [Log]: {},
+                },
+            },
+        },
+        ARCHIVED: {},
+    }
+
+class Tests(unittest.TestCase):
+
+    def setUp(self):
+        self.data = { 'state': 'ORDERED' }
+        self.chart = TestChart(self.data, storage=CountingStorage())
+        mockFn.reset_mock()
+
+    def test_to_path(self):
+        state = self.chart.to_path(['PAID', TestChart.SHIPPED, 'DELIVERED'], paid=True, shippable=True, note='done')
+        self.assertEqual(state, TestChart.DELIVERED)
+        self.assertEqual(self.data['state'], 'DELIVERED')
+        self.assertEqual(mockFn.call_args_list, [
+            call('Paid'), call('Shippable'),
+            call('set', 'DELIVERED'),
+            call('Pay'), call('Ship'), call('Log', 'done'),
+        ])
+
+    def test_blocked_hop(self):
+        with self.assertRaises(TransitionNotAllowed) as context:
+            self.chart.to_path(['PAID', 'SHIPPED', 'DELIVERED'], paid=True, shippable=False)
+        self.assertEqual(str(context.exception), 'Not shippable')
+        self.assertRaises(TransitionMissingArgs, self.chart.to_path, ['PAID', 'SHIPPED'], paid=True)
+        self.assertEqual(self.data['state'], 'ORDERED')
+        self.assertEqual(mockFn.call_args_list, [call('Paid'), call('Shippable'), call('Paid')])
+
+    def test_missing_hop(self):
+        self.assertRaises(TransitionDoesNotExist, self.chart.to_path, ['PAID', 'DELIVERED'], paid=True)
+        mockFn.assert_not_called()
+
+    def test_empty_path(self):
+        self.assertEqual(self.chart.to_path([]), TestChart.ORDERED)
+        mockFn.assert_not_called()
+
+    def test_route_to(self):
+        state = self.chart.route_to('DELIVERED', paid=True, shippable=True)
+        self.assertEqual(state, TestChart.DELIVERED)
+        self.assertEqual([args[0] for args, _ in mockFn.call_args_list], ['Paid', 'Shippable', 'set', 'Pay', 'Ship', 'Log'])
+
+    def test_route_refused(self):
+        self.assertRaises(TransitionNotAllowed, self.chart.route_to, 'DELIVERED', paid=False, shippable=True)
+        self.assertRaises(TransitionDoesNotExist, self.chart.route_to, 'ARCHIVED')
+        self.assertEqual(self.data['state'], 'ORDERED')
+
+    def test_journaled_per_hop(self):
+        entries = []
+        with patch.object(TestChart, 'journal', entries.append):
+            self.chart.to_path(['PAID', 'SHIPPED'], paid=True, shippable=True)
+        self.assertEqual([(entry.source, entry.target) for entry in entries], [('ORDERED', 'PAID'), ('PAID', 'SHIPPED')])
+
+    def test_metrics_per_hop(self):
+        metrics = ChartMetrics(buckets=(0.5,))
+        # Every clock reading is a second after the last
+        with patch.object(TestChart, 'metrics', metrics), patch('levee.chart.perf_counter', side_effect=count()):
+            self.chart.to_path(['PAID', 'SHIPPED'], paid=True, shippable=True)
+        for edge in metrics.export():
+            self.assertEqual(edge['lookup']['sum'], 1.0)
+            self.assertEqual(edge['lookup']['buckets'][0], [0.5, 0])
@@ -0,0 +1,116 @@
+from util.import_relative import enable_imports
+enable_imports(__file__, '../../src')
+
+import unittest
+from unittest.mock import Mock, patch
+from levee import Chart, State, Condition, Effect
+from levee.plan import TransitionPlan
+
+mockFn = Mock()
+
+class TestChart(Chart):
+    class ALPHA(State): pass
+    class BETA(State): pass
+
+    class Sometimes(Condition):
+
+        def eval(self, sometimes, often=True):
+            return sometimes and often
+
+    class CallMock(Effect):
+
+        def exec(self, whatever):
+            mockFn(whatever)
+
+    chart = {
+        ALPHA: {
+            BETA (Sometimes) [CallMock + CallMock]: ...,
+        },
+        BETA: {
+            ALPHA: ...,
+        },
+    }
+
+class Tests(unittest.TestCase):
+
+    def setUp(self):
+        self.data = { 'state': None }
+        self.chart = TestChart(self.data)
+        mockFn.reset_mock()
+
+    def test_plans(self):
+        plan = TestChart.plans[TestChart.ALPHA]['BETA']
+        self.assertIsInstance(plan, TransitionPlan)
+        self.assertIs(plan.source, TestChart.ALPHA)
+        self.assertIs(plan.target, TestChart.BETA)
+        self.assertEqual(plan.params, {'sometimes', 'often', 'whatever'})
+        self.assertEqual(plan.required_params, {'sometimes', 'whatever'})
+        self.assertEqual(len(plan.effects), 2)
+        self.assertIsNone(TestChart.plans[TestChart.BETA]['ALPHA'].condition)
+        self.assertRaises(AttributeError, setattr, plan, 'target', TestChart.ALPHA)
+
+    def test_no_introspection_per_call(self):
+        with patch('levee.expressions.signature') as signature:
+            self.assertEqual(self.chart.can(TestChart.BETA, sometimes=True, whatever='once'), True)
+            self.assertEqual(self.chart.can(TestChart.BETA, sometimes=True, often=False, whatever='once'), False)
+            self.chart.to(TestChart.BETA, sometimes=True, whatever='once')
+            self.assertEqual(self.chart.choices(), ((TestChart.ALPHA.value, TestChart.ALPHA.pretty_value),))
+            signature.assert_not_called()
+        self.assertEqual(mockFn.call_count, 2)
+
+    def test_static_and_class_methods(self):
+        class MethodChart(Chart):
+            class ALPHA(State): pass
+            class BETA(State): pass
+            class GAMMA(State): pass
+
+            class Static(Condition):
+
+                @staticmethod
+                def eval(amount):
+                    return amount > 10
+
+            class Class(Condition):
+
+                @classmethod
+                def eval(cls, amount, limit=100):
+                    return amount < limit
+
+            chart = {
+                ALPHA: {
+                    BETA (Static): ...,
+                    GAMMA (Class): ...,
+                },
+                BETA: {},
+                GAMMA: {},
+            }
+
+        plans = MethodChart.plans[MethodChart.ALPHA]
+        self.assertEqual(plans['BETA'].required_params, {'amount'})
+        self.assertEqual(plans['GAMMA'].params, {'amount', 'limit'})
+        chart = MethodChart({ 'state': 'ALPHA' })
+        self.assertEqual(chart.can('BETA', amount=50), True)
+        self.assertEqual(chart.can('GAMMA', amount=500), False)
+        self.assertEqual(chart.can('GAMMA', amount=50), True)
+
+    def test_compiled_on_first_use(self):
+        with patch.object(TransitionPlan, 'compile', wraps=TransitionPlan.compile) as compile:
+            class LazyChart(Chart):
+                ALPHA = TestChart.ALPHA
+                BETA = TestChart.BETA
+                chart = {
+                    ALPHA: {
+                        BETA (TestChart.Sometimes): ...,
+                    },
+                    BETA: {
+                        ALPHA: ...,
+                    },
+                }
+            compile.assert_not_called()
+            plan = LazyChart.plans[LazyChart.ALPHA]['BETA']
+            self.assertEqual(plan.required_params, {'sometimes'})
+            self.assertEqual(plan.params, {'sometimes', 'often'})
+            self.assertEqual(LazyChart({ 'state': None }).can('BETA', sometimes=True), True)
+            compile.assert_called_once_with(LazyChart.ALPHA, plan.transition)
+            self.assertIs(type(plan), TransitionPlan)
+        self.assertRaises(AttributeError, getattr, plan, 'unknown')
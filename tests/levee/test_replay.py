@@ -0,0 +1,161 @@
+from util.import_relative import enable_imports
+enable_imports(__file__, '../../src')
+
+import os
+import json
+import tempfile
+import unittest
+from unittest.mock import Mock, patch
+from levee import Chart, State, Condition, Effect
+from levee.exceptions import LeveeException, TransitionConflict, TransitionDoesNotExist
+from levee.journal import JournalWriter
+from levee.replay import Replay
+from levee.storage import DictStorage
+
+conditionFn = Mock()
+effectFn = Mock()
+
+class TestChart(Chart):
+    class ALPHA(State): pass
+    class BETA(State): pass
+    class GAMMA(State): pass
+
+    class Sometimes(Condition):
+
+        def eval(self, sometimes):
+            conditionFn()
+            return sometimes if sometimes else 'Not this time'
+
+    class CallMock(Effect):
+
+        def exec(self):
+            effectFn()
+
+    chart = {
+        ALPHA: {
+            BETA (Sometimes) [CallMock]: ...,
+        },
+        BETA: {
+            GAMMA [CallMock]: ...,
+        },
+        GAMMA: {
+            ALPHA: ...,
+        },
+    }
+
+def line(key, source, target, reason=None):
+    return json.dumps([key, source, target, None, 0.0, 0.0, reason]) + '\n'
+
+class Tests(unittest.TestCase):
+
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.journal_path = os.path.join(self.directory.name, 'journal.jsonl')
+        self.snapshot_path = os.path.join(self.directory.name, 'snapshot.json')
+        conditionFn.reset_mock()
+        effectFn.reset_mock()
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def write(self, *lines):
+        with open(self.journal_path, 'a') as file:
+            file.write(''.join(lines))
+
+    def test_from_journal(self):
+        rows = [{ 'id': index, 'state': None } for index in range(3)]
+        storage = DictStorage(id_key='id')
+        with JournalWriter(self.journal_path) as writer, patch.object(TestChart, 'journal', writer):
+            for row in rows:
+                TestChart(row, storage=storage).to('BETA', sometimes=True)
+            TestChart(rows[0], storage=storage).to('GAMMA')
+            self.assertRaises(TransitionDoesNotExist, TestChart(rows[1], storage=storage).to, 'ALPHA')
+        conditionFn.reset_mock()
+        effectFn.reset_mock()
+
+        replay = TestChart.replay(self.journal_path)
+        self.assertEqual(replay.states, { row['id']: row['state'] for row in rows })
+        self.assertEqual(replay.count, 4)
+        self.assertEqual(replay.skipped, 0)
+        conditionFn.assert_not_called()
+        effectFn.assert_not_called()
+
+    def test_without_keys(self):
+        with JournalWriter(self.journal_path) as writer, patch.object(TestChart, 'journal', writer):
+            for _ in range(3):
+                row = { 'state': None }
+                TestChart(row).to('BETA', sometimes=True)
+                TestChart(row).to('GAMMA')
+        replay = TestChart.replay(self.journal_path)
+        self.assertEqual(replay.states, {})
+        self.assertEqual((replay.count, replay.skipped), (0, 0))
+
+    def test_snapshots(self):
+        self.write(line(1, 'ALPHA', 'BETA'), line(2, 'ALPHA', 'BETA', 'Not this time'), line(1, 'BETA', 'GAMMA'))
+        replay = TestChart.replay(self.journal_path, self.snapshot_path, snapshot_every=1)
+        self.assertEqual(replay.states, { 1: 'GAMMA' })
+        self.write(line(1, 'GAMMA', 'ALPHA'), line(2, 'ALPHA', 'BETA'))
+        self.assertEqual(Replay.load(TestChart, self.snapshot_path).count, 2)
+
+        replay = TestChart.replay(self.journal_path, self.snapshot_path)
+        self.assertEqual(replay.states, { 1: 'ALPHA', 2: 'BETA' })
+        self.assertEqual(replay.count, 4)
+        self.assertEqual(replay.offset, os.path.getsize(self.journal_path))
+
+    def test_incomplete_line(self):
+        self.write(line(1, 'ALPHA', 'BETA'), line(1, 'BETA', 'GAMMA')[:10])
+        replay = TestChart.replay(self.journal_path, self.snapshot_path)
+        self.assertEqual(replay.states, { 1: 'BETA' })
+        self.write(line(1, 'BETA', 'GAMMA')[10:])
+        self.assertEqual(TestChart.replay(self.journal_path, self.snapshot_path).states, { 1: 'GAMMA' })
+
+    def test_invalid(self):
+        self.write(
+            line(1, 'ALPHA', 'BETA'),
+            line(1, 'BETA', 'ALPHA'),
+            line(2, 'ALPHA', 'BETA'),
+            line(2, 'GAMMA', 'ALPHA'),
+            line(1, 'BETA', 'GAMMA'),
+        )
+        replay = TestChart.replay(self.journal_path, self.snapshot_path)
+        self.assertEqual(replay.states, { 1: 'GAMMA', 2: 'BETA' })
+        self.assertEqual((replay.count, replay.skipped), (3, 2))
+        self.assertIsInstance(replay.errors[0], TransitionDoesNotExist)
+        self.assertIsInstance(replay.errors[1], TransitionConflict)
+        self.assertEqual(Replay.load(TestChart, self.snapshot_path).skipped, 2)
+        self.assertRaises(TransitionConflict, replay.apply, 2, 'GAMMA', 'ALPHA')
+
+    def test_malformed_lines(self):
+        torn = line(1, 'BETA', 'GAMMA')[:10]
+        self.write(
+            line(1, 'ALPHA', 'BETA'),
+            torn + line(2, 'ALPHA', 'BETA'),
+            json.dumps([2, 'ALPHA']) + '\n',
+            json.dumps([[2], 'ALPHA', 'BETA', None, 0.0, 0.0, None]) + '\n',
+            line(3, 'ALPHA', 'BETA'),
+        )
+        replay = TestChart.replay(self.journal_path, self.snapshot_path)
+        self.assertEqual(replay.states, { 1: 'BETA', 3: 'BETA' })
+        self.assertEqual((replay.count, replay.skipped), (2, 3))
+        self.assertIsInstance(replay.errors[0], LeveeException)
+        self.assertEqual(replay.offset, os.path.getsize(self.journal_path))
+
+        self.write(line(1, 'BETA', 'GAMMA'))
+        replay = TestChart.replay(self.journal_path, self.snapshot_path)
+        self.assertEqual(replay.states, { 1: 'GAMMA', 3: 'BETA' })
+
+    def test_writer_after_crash(self):
+        self.write(line(1, 'ALPHA', 'BETA'), line(1, 'BETA', 'GAMMA')[:10])
+        row = { 'id': 2, 'state': None }
+        with JournalWriter(self.journal_path) as writer, patch.object(TestChart, 'journal', writer):
+            TestChart(row, storage=DictStorage(id_key='id')).to('BETA', sometimes=True)
+        replay = TestChart.replay(self.journal_path)
+        self.assertEqual(replay.states, { 1: 'BETA', 2: 'BETA' })
+        self.assertEqual(replay.skipped, 1)
+
+    def test_wrong_snapshot(self):
+        Replay(TestChart).save(self.snapshot_path)
+        class OtherChart(Chart):
+            class ALPHA(State): pass
+            chart = { ALPHA: {} }
+        self.assertRaises(LeveeException, Replay.load, OtherChart, self.snapshot_path)
@@ -0,0 +1,78 @@
+from util.import_relative import enable_imports
+enable_imports(__file__, '../../src')
+
+import unittest
+from unittest.mock import Mock
+from levee import Chart, State, Condition
+from levee.exceptions import TransitionNotAllowed
+
+mockFn = Mock()
+
+class Cheap(Condition):
+
+    def eval(self, cheap):
+        return cheap if cheap else 'Too cheap'
+
+class Expensive(Condition):
+    cost = 100
+
+    def eval(self, expensive):
+        mockFn(expensive)
+        return expensive if expensive else 'Too expensive'
+
+class TestChart(Chart):
+    short_circuit = True
+
+    class ALPHA(State): pass
+    class BETA(State): pass
+    class GAMMA(State): pass
+
+    chart = {
+        ALPHA: {
+            BETA (Expensive | Cheap): ...,
+            GAMMA (Expensive & Cheap): ...,
+        },
+        BETA: {},
+        GAMMA: {},
+    }
+
+class FullChart(TestChart):
+    short_circuit = False
+
+    ALPHA = TestChart.ALPHA
+    BETA = TestChart.BETA
+    GAMMA = TestChart.GAMMA
+
+    chart = TestChart.chart
+
+class Tests(unittest.TestCase):
+
+    def setUp(self):
+        self.data = { 'state': None }
+        self.chart = TestChart(self.data)
+        mockFn.reset_mock()
+
+    def test_or(self):
+        self.assertEqual(self.chart.can(TestChart.BETA, cheap=True, expensive=False), True)
+        mockFn.assert_not_called()
+        self.assertEqual(self.chart.can(TestChart.BETA, cheap=False, expensive=True), True)
+        mockFn.assert_called_once_with(True)
+
+    def test_and(self):
+        with self.assertRaises(TransitionNotAllowed) as context:
+            self.chart.to(TestChart.GAMMA, cheap=False, expensive=True)
+        self.assertEqual(str(context.exception), 'Too cheap')
+        mockFn.assert_not_called()
+        self.assertEqual(self.chart.can(TestChart.GAMMA, cheap=True, expensive=True), True)
+        mockFn.assert_called_once_with(True)
+
+    def test_reason_order(self):
+        with self.assertRaises(TransitionNotAllowed) as context:
+            self.chart.to(TestChart.BETA, cheap=False, expensive=False)
+        self.assertEqual(str(context.exception), 'Too expensive and Too cheap')
+
+    def test_full_evaluation(self):
+        chart = FullChart(self.data)
+        self.assertEqual(chart.can(FullChart.BETA, cheap=True, expensive=False), True)
+        self.assertEqual(chart.can(FullChart.GAMMA, cheap=False, expensive=True), False)
+        self.assertEqual(mockFn.call_count, 2)
@@ -0,0 +1,67 @@
+from util.import_relative import enable_imports
+enable_imports(__file__, '../../src')
+
+import unittest
+from levee import Chart, State
+from levee.exceptions import LeveeException, TransitionError
+
+class TestChart(Chart):
+    class ALPHA(State): pass
+    class BETA(State): pass
+
+    chart = {
+        ALPHA: {
+            BETA: ...,
+        },
+        BETA: {
+            ALPHA: ...,
+        },
+    }
+
+class OtherChart(Chart):
+    class ALPHA(State): pass
+
+    chart = {
+        ALPHA: {},
+    }
+
+def make_wide_chart(size):
+    states = {
+        f'S{i}': type(f'S{i}', (State,), {})
+        for i in range(size)
+    }
+    ordered = list(states.values())
+    states['chart'] = {
+        state: { ordered[(i + 1) % size]: ... }
+        for i, state in enumerate(ordered)
+    }
+    return type('WideChart', (Chart,), states)
+
+class Tests(unittest.TestCase):
+
+    def setUp(self):
+        self.data = { 'state': None }
+        self.chart = TestChart(self.data)
+
+    def test_resolve(self):
+        self.assertIs(TestChart.resolve('BETA'), TestChart.BETA)
+        self.assertIs(TestChart.resolve(TestChart.BETA), TestChart.BETA)
+        self.assertIs(TestChart.resolve(TestChart.BETA(conditionless=True)), TestChart.BETA)
+        self.assertIs(TestChart.resolve(OtherChart.ALPHA), TestChart.ALPHA)
+        self.assertRaises(TransitionError, TestChart.resolve, 'DELTA')
+        self.assertRaises(TransitionError, TestChart.resolve, ['ALPHA'])
+
+    def test_unknown_stored_state(self):
+        self.data['state'] = 'DELTA'
+        self.assertRaises(LeveeException, getattr, self.chart, 'state')
+        self.data['state'] = ['ALPHA']
+        self.assertRaises(LeveeException, getattr, self.chart, 'state')
+
+    def test_wide_chart(self):
+        WideChart = make_wide_chart(900)
+        data = { 'state': 'S898' }
+        chart = WideChart(data)
+        self.assertIs(chart.state, WideChart.S898)
+        chart.to('S899')
+        chart.to(WideChart.S0)
+        self.assertEqual(data['state'], 'S0')
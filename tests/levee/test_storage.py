@@ -0,0 +1,124 @@
+from util.import_relative import enable_imports
+enable_imports(__file__, '../../src')
+
+import sqlite3
+import unittest
+from unittest.mock import Mock
+from levee import Chart, State, Condition, Effect
+from levee.batch import BatchResult
+from levee.exceptions import LeveeException, TransitionConflict
+from levee.storage import Storage, DictStorage, AttributeStorage, SQLiteStorage
+
+effectFn = Mock()
+
+class TestChart(Chart):
+    class ALPHA(State): pass
+    class BETA(State): pass
+    class GAMMA(State): pass
+
+    class Interrupted(Condition):
+
+        def eval(self, connection, key):
+            connection.execute('UPDATE orders SET status = ? WHERE id = ?', ('GAMMA', key))
+            return True
+
+    class CallMock(Effect):
+
+        def exec(self):
+            effectFn()
+
+    chart = {
+        ALPHA: {
+            BETA [CallMock]: ...,
+            GAMMA (Interrupted) [CallMock]: ...,
+        },
+        BETA: {
+            GAMMA: ...,
+        },
+        GAMMA: {},
+    }
+
+class ListStorage(Storage):
+
+    def __init__(self, values):
+        self.values = values
+
+    def get(self, obj):
+        return self.values[obj]
+
+    def set(self, obj, value):
+        self.values[obj] = value
+
+class Tests(unittest.TestCase):
+
+    def setUp(self):
+        self.connection = sqlite3.connect(':memory:')
+        self.connection.execute('CREATE TABLE orders (id INTEGER PRIMARY KEY, status TEXT)')
+        self.connection.executemany('INSERT INTO orders VALUES (?, ?)', [(1, None), (2, 'ALPHA'), (3, 'BETA')])
+        self.connection.commit()
+        self.storage = SQLiteStorage(self.connection, 'orders', state_column='status')
+        effectFn.reset_mock()
+
+    def tearDown(self):
+        self.connection.close()
+
+    def status(self, key):
+        return self.connection.execute('SELECT status FROM orders WHERE id = ?', (key,)).fetchone()[0]
+
+    def test_default_storage(self):
+        self.assertIsInstance(TestChart({ 'state': None }).storage, DictStorage)
+        self.assertIsInstance(TestChart(Mock(state=None)).storage, AttributeStorage)
+
+    def test_custom_storage(self):
+        values = [None, 'BETA']
+        chart = TestChart(0, storage=ListStorage(values))
+        self.assertEqual(values, ['ALPHA', 'BETA'])
+        chart.to(TestChart.BETA)
+        TestChart(1, storage=ListStorage(values)).to(TestChart.GAMMA)
+        self.assertEqual(values, ['BETA', 'GAMMA'])
+
+    def test_sqlite(self):
+        chart = TestChart(1, storage=self.storage)
+        self.assertEqual(self.status(1), 'ALPHA')
+        chart.to(TestChart.BETA)
+        self.assertEqual(self.status(1), 'BETA')
+        self.assertEqual(chart.state, TestChart.BETA)
+        self.assertRaises(LeveeException, TestChart, 99, storage=self.storage)
+
+    def test_sqlite_conflict(self):
+        chart = TestChart(2, storage=self.storage)
+        self.assertRaises(TransitionConflict, chart.to, TestChart.GAMMA, connection=self.connection, key=2)
+        self.assertEqual(self.status(2), 'GAMMA')
+        effectFn.assert_not_called()
+
+    def test_sqlite_other_connection(self):
+        chart = TestChart(2, storage=self.storage)
+        self.assertEqual(chart.state, TestChart.ALPHA)
+        self.connection.execute('UPDATE orders SET status = ? WHERE id = ?', ('BETA', 2))
+        self.assertTrue(self.storage.compare_and_set(2, 'BETA', 'GAMMA'))
+        self.assertFalse(self.storage.compare_and_set(2, 'BETA', 'GAMMA'))
+
+    def test_transaction(self):
+        with self.storage.transaction():
+            TestChart(1, storage=self.storage).to(TestChart.BETA)
+            TestChart(2, storage=self.storage).to(TestChart.BETA)
+            self.connection.rollback()
+        self.assertEqual([self.status(1), self.status(2)], [None, 'ALPHA'])
+
+        with self.assertRaises(ValueError):
+            with self.storage.transaction():
+                TestChart(2, storage=self.storage).to(TestChart.BETA)
+                raise ValueError()
+        self.assertEqual(self.status(2), 'ALPHA')
+
+    def test_bulk(self):
+        results = TestChart.bulk_to([1, 2, 3], TestChart.BETA, storage=self.storage)
+        self.assertEqual(
+            [result.status for result in results],
+            [BatchResult.MOVED, BatchResult.MOVED, BatchResult.NO_TRANSITION],
+        )
+        self.assertEqual([self.status(key) for key in (1, 2, 3)], ['BETA', 'BETA', 'BETA'])
+        self.assertEqual(effectFn.call_count, 2)
+
+    def test_identifiers(self):
+        self.assertRaises(LeveeException, SQLiteStorage, self.connection, 'orders; DROP TABLE orders')
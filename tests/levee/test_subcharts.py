@@ -0,0 +1,209 @@
+from util.import_relative import enable_imports
+enable_imports(__file__, '../../src')
+
+import asyncio
+import unittest
+from unittest.mock import patch
+from levee import Chart, State, Condition
+from levee.exceptions import ChartSyntaxError, LeveeException, TransitionDoesNotExist, TransitionNotAllowed
+from levee.locks import StripedLocks
+from levee.metrics import ChartMetrics
+from levee.replay import Replay
+from levee.storage import DictStorage
+
+class PaymentChart(Chart):
+    class PENDING(State): pass
+    class AUTHORIZED(State): pass
+    class CAPTURED(State): pass
+
+    class Approved(Condition):
+
+        def eval(self, approved=True):
+            return approved if approved else 'Not approved'
+
+    chart = {
+        PENDING: {
+            AUTHORIZED(Approved): {
+                CAPTURED: {},
+            },
+        },
+    }
+
+class TestChart(Chart):
+    class CART(State): pass
+    class PAYMENT(State):
+        subchart = PaymentChart
+    class SHIPPED(State): pass
+
+    chart = {
+        CART: {
+            PAYMENT: {
+                SHIPPED: {},
+                CART: ...,
+            },
+        },
+    }
+
+class LazyChart(Chart):
+    class CART(State): pass
+    class PAYMENT(State):
+        subchart = f'{__name__}:PaymentChart'
+
+    chart = {
+        CART: {
+            PAYMENT: {},
+        },
+    }
+
+class Tests(unittest.TestCase):
+
+    def test_enter_subchart_at_initial_state(self):
+        obj = { 'state': None }
+        chart = TestChart(obj)
+        self.assertIsNone(chart.subchart)
+        chart.to('PAYMENT')
+        self.assertEqual(obj['state'], 'PAYMENT.PENDING')
+        self.assertIs(chart.state, TestChart.PAYMENT)
+        self.assertIs(chart.subchart.state, PaymentChart.PENDING)
+
+    def test_subchart_transitions(self):
+        obj = { 'state': 'PAYMENT.PENDING' }
+        chart = TestChart(obj)
+        chart.subchart.to('AUTHORIZED')
+        self.assertEqual(obj['state'], 'PAYMENT.AUTHORIZED')
+        chart.to('PAYMENT.CAPTURED')
+        self.assertEqual(obj['state'], 'PAYMENT.CAPTURED')
+        self.assertIs(chart.state, TestChart.PAYMENT)
+
+    def test_subchart_conditions(self):
+        obj = { 'state': 'PAYMENT.PENDING' }
+        chart = TestChart(obj)
+        with self.assertRaises(TransitionNotAllowed):
+            chart.to('PAYMENT.AUTHORIZED', approved=False)
+        self.assertEqual(obj['state'], 'PAYMENT.PENDING')
+
+    def test_leave_subchart(self):
+        obj = { 'state': 'PAYMENT.AUTHORIZED' }
+        chart = TestChart(obj)
+        chart.to('SHIPPED')
+        self.assertEqual(obj['state'], 'SHIPPED')
+        self.assertIsNone(chart.subchart)
+
+    def test_composite_target_outside_current_state(self):
+        chart = TestChart({ 'state': 'CART' })
+        with self.assertRaises(TransitionDoesNotExist):
+            chart.to('PAYMENT.CAPTURED')
+        chart = TestChart({ 'state': 'PAYMENT.PENDING' })
+        with self.assertRaises(TransitionDoesNotExist):
+            chart.to('PAYMENT.CAPTURED')
+
+    def test_can_and_explain(self):
+        chart = TestChart({ 'state': 'PAYMENT.PENDING' })
+        self.assertEqual(chart.can('PAYMENT.AUTHORIZED'), True)
+        self.assertEqual(chart.can('PAYMENT.AUTHORIZED', approved=False), False)
+        self.assertEqual(chart.explain('PAYMENT.AUTHORIZED', approved=False).reason, 'Not approved')
+        self.assertEqual(chart.can('SHIPPED'), True)
+        self.assertRaises(TransitionDoesNotExist, chart.can, 'PAYMENT.CAPTURED')
+
+    def test_unbound(self):
+        self.assertEqual(TestChart.next_state('CART', 'PAYMENT'), 'PAYMENT.PENDING')
+        self.assertEqual(TestChart.next_state('PAYMENT.PENDING', 'SHIPPED'), 'SHIPPED')
+        self.assertEqual(TestChart.next_state('PAYMENT.PENDING', 'PAYMENT.AUTHORIZED'), 'PAYMENT.AUTHORIZED')
+        self.assertEqual(TestChart.next_state('PAYMENT', 'PAYMENT.AUTHORIZED'), 'PAYMENT.AUTHORIZED')
+        self.assertRaises(TransitionNotAllowed, TestChart.next_state, 'PAYMENT.PENDING', 'PAYMENT.AUTHORIZED', approved=False)
+        self.assertRaises(TransitionDoesNotExist, TestChart.next_state, 'CART', 'PAYMENT.AUTHORIZED')
+        self.assertEqual(TestChart.allowed('PAYMENT.PENDING'), ('PAYMENT.AUTHORIZED', 'SHIPPED', 'CART'))
+        self.assertEqual(TestChart.allowed('PAYMENT.CAPTURED'), ('SHIPPED', 'CART'))
+        self.assertEqual(TestChart.allowed('CART'), ('PAYMENT.PENDING',))
+
+    def test_bulk(self):
+        rows = [{ 'state': 'PAYMENT.CAPTURED' }, { 'state': 'CART' }, { 'state': 'PAYMENT.REFUNDED' }]
+        results = TestChart.bulk_to(rows, 'SHIPPED')
+        self.assertEqual([result.status for result in results], ['moved', 'no_transition', 'no_transition'])
+        self.assertEqual([row['state'] for row in rows], ['SHIPPED', 'CART', 'PAYMENT.REFUNDED'])
+        self.assertEqual(TestChart.bulk_to(rows[1:2], 'PAYMENT')[0].status, 'moved')
+        self.assertEqual(rows[1]['state'], 'PAYMENT.PENDING')
+
+    def test_hooks(self):
+        entries = []
+        metrics = ChartMetrics()
+        locks = StripedLocks(1)
+        obj = { 'id': 1, 'state': None }
+        with patch.object(TestChart, 'journal', entries.append), \
+                patch.object(TestChart, 'metrics', metrics), patch.object(TestChart, 'locks', locks):
+            chart = TestChart(obj, storage=DictStorage(id_key='id'))
+            chart.to('PAYMENT')
+            self.assertRaises(TransitionNotAllowed, chart.to, 'PAYMENT.AUTHORIZED', approved=False)
+            chart.to('PAYMENT.AUTHORIZED')
+            chart.to('PAYMENT.CAPTURED')
+            chart.to('SHIPPED')
+        self.assertEqual(
+            [(entry.source, entry.target, entry.reason) for entry in entries],
+            [
+                ('CART', 'PAYMENT.PENDING', None),
+                ('PAYMENT.PENDING', 'PAYMENT.AUTHORIZED', 'Not approved'),
+                ('PAYMENT.PENDING', 'PAYMENT.AUTHORIZED', None),
+                ('PAYMENT.AUTHORIZED', 'PAYMENT.CAPTURED', None),
+                ('PAYMENT.CAPTURED', 'SHIPPED', None),
+            ],
+        )
+        edges = { (edge['from'], edge['to']): edge for edge in metrics.export() }
+        self.assertEqual(edges[('PAYMENT.PENDING', 'PAYMENT.AUTHORIZED')]['blocked'], 1)
+        self.assertEqual(edges[('PAYMENT.AUTHORIZED', 'PAYMENT.CAPTURED')]['moved'], 1)
+        self.assertEqual(locks.stats()['acquired'], 4)
+
+        replay = Replay(TestChart)
+        for entry in entries[:4]:
+            if entry.reason is None:
+                replay.apply(entry.key, entry.source, entry.target)
+        self.assertEqual(replay.states, { 1: 'PAYMENT.CAPTURED' })
+        replay.apply(1, 'PAYMENT.CAPTURED', 'SHIPPED')
+        self.assertEqual(replay.states, { 1: 'SHIPPED' })
+        for source, target in (('SHIPPED', 'PAYMENT'), ('CART', 'PAYMENT.AUTHORIZED'), ('PAYMENT.PENDING', 'PAYMENT.CAPTURED')):
+            with self.subTest(source=source, target=target), self.assertRaises(TransitionDoesNotExist):
+                Replay(TestChart).apply(1, source, target)
+
+    def test_async(self):
+        obj = { 'state': 'PAYMENT.PENDING' }
+        chart = TestChart(obj)
+        async def run():
+            self.assertEqual(await chart.acan('PAYMENT.AUTHORIZED'), True)
+            await chart.ato('PAYMENT.AUTHORIZED')
+        asyncio.run(run())
+        self.assertEqual(obj['state'], 'PAYMENT.AUTHORIZED')
+
+    def test_unknown_composite_values(self):
+        for value in ('PAYMENT.REFUNDED', 'CART.PENDING', 'PAYMENT.PENDING.AGAIN'):
+            with self.subTest(value=value), self.assertRaises(LeveeException):
+                TestChart({ 'state': value }).state
+
+    def test_bare_value_starts_subchart(self):
+        obj = { 'state': 'PAYMENT' }
+        chart = TestChart(obj)
+        self.assertIs(chart.state, TestChart.PAYMENT)
+        self.assertIs(chart.subchart.state, PaymentChart.PENDING)
+        self.assertEqual(obj['state'], 'PAYMENT.PENDING')
+
+    def test_lazy_import(self):
+        self.assertNotIn('_subchart_class', LazyChart.PAYMENT.__dict__)
+        obj = { 'state': None }
+        chart = LazyChart(obj)
+        chart.to('PAYMENT')
+        self.assertEqual(obj['state'], 'PAYMENT.PENDING')
+        self.assertIs(LazyChart.PAYMENT._subchart_class, PaymentChart)
+
+    def test_bad_subchart(self):
+        class BadChart(Chart):
+            class CART(State): pass
+            BROKEN = type('BROKEN', (State,), { 'subchart': 'levee.nothing:Missing' })
+
+            chart = {
+                CART: {
+                    BROKEN: {},
+                },
+            }
+        with self.assertRaises(ChartSyntaxError):
+            BadChart({ 'state': 'CART' }).to('BROKEN')
+
+if __name__ == '__main__':
+    unittest.main()
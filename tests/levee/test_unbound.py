@@ -0,0 +1,57 @@
+from util.import_relative import enable_imports
+enable_imports(__file__, '../../src')
+
+import unittest
+from unittest.mock import Mock
+from levee import Chart, State, Condition, Effect
+from levee.exceptions import TransitionDoesNotExist, TransitionError, TransitionMissingArgs, TransitionNotAllowed
+
+effectFn = Mock()
+
+class TestChart(Chart):
+    class ALPHA(State): pass
+    class BETA(State): pass
+    class GAMMA(State): pass
+
+    class Sometimes(Condition):
+
+        def eval(self, sometimes):
+            return sometimes if sometimes else 'Not this time'
+
+    class CallMock(Effect):
+
+        def exec(self):
+            effectFn()
+
+    chart = {
+        ALPHA: {
+            BETA (Sometimes) [CallMock]: ...,
+            GAMMA: ...,
+        },
+        BETA: {
+            GAMMA: ...,
+        },
+        GAMMA: {},
+    }
+
+class Tests(unittest.TestCase):
+
+    def test_next_state(self):
+        self.assertEqual(TestChart.next_state('ALPHA', 'BETA', sometimes=True), 'BETA')
+        self.assertEqual(TestChart.next_state(None, TestChart.GAMMA), 'GAMMA')
+        self.assertEqual(TestChart.next_state(TestChart.BETA, 'GAMMA'), 'GAMMA')
+        effectFn.assert_not_called()
+
+    def test_next_state_refused(self):
+        with self.assertRaises(TransitionNotAllowed) as context:
+            TestChart.next_state('ALPHA', 'BETA', sometimes=False)
+        self.assertEqual(str(context.exception), 'Not this time')
+        self.assertRaises(TransitionMissingArgs, TestChart.next_state, 'ALPHA', 'BETA')
+        self.assertRaises(TransitionDoesNotExist, TestChart.next_state, 'GAMMA', 'ALPHA')
+        self.assertRaises(TransitionError, TestChart.next_state, 'UNKNOWN', 'ALPHA')
+
+    def test_allowed(self):
+        self.assertEqual(TestChart.allowed('ALPHA', sometimes=True), ('BETA', 'GAMMA'))
+        self.assertEqual(TestChart.allowed(None, sometimes=False), ('GAMMA',))
+        self.assertEqual(TestChart.allowed('GAMMA'), ())
+        self.assertRaises(TransitionMissingArgs, TestChart.allowed, 'ALPHA')